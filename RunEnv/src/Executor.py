@@ -9,14 +9,51 @@ import subprocess
 import tempfile
 import shutil
 from pathlib import Path
-from typing import List, Dict, Tuple, Any
+from typing import List, Dict, Tuple, Any, Optional
+import asyncio
+import hashlib
 import json
+import logging
+import multiprocessing
+import queue
+import threading
+import time
+import weakref
+from concurrent.futures import CancelledError, Future, ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
 
 # 导入ClassFileRunner
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-from TestRun import ClassFileRunner
-from GCLogAnalyzer import GCLogAnalyzer
+from TestRun import ClassFileRunner, setup_logging
+from GCLogAnalyzer import parse_gc_log_file
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+# 不保留GC日志时每个同时运行的JVM在内存文件系统上预留的空间：HotSpot默认按5个20MB的文件轮转GC日志
+_GC_LOG_BYTES_PER_JVM = 5 * 20 * 1024 * 1024
+
+
+def _loads_json(content: bytes) -> Any:
+    """
+    解析JSON字节串，安装了orjson时优先使用orjson
+    """
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+def _dumps_json(data: Any) -> bytes:
+    """
+    将数据序列化为缩进2格的UTF-8 JSON字节串，安装了orjson时优先使用orjson
+    """
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
 
 
 class JDKDifferentialTester:
@@ -72,232 +109,361 @@ class JDKDifferentialTester:
         ]
     }
 
-    def __init__(self, timeout_seconds=60, keep_gc_logs=False):
+    # GC参数组合到简短GC名称的映射，用于GC日志文件命名
+    GC_NAMES = {
+        frozenset({"-XX:+UseSerialGC"}): "SerialGC",
+        frozenset({"-XX:+UseParallelGC"}): "ParallelGC",
+        frozenset({"-XX:+UseParallelOldGC"}): "ParallelOldGC",
+        frozenset({"-XX:+UseG1GC"}): "G1GC",
+        frozenset({"-XX:+UseZGC"}): "ZGC",
+        frozenset({"-XX:+UseShenandoahGC"}): "ShenandoahGC",
+        frozenset({"-XX:+UnlockExperimentalVMOptions", "-XX:+UseShenandoahGC"}): "ShenandoahGC",
+        frozenset({"-XX:+UseShenandoahGC", "-XX:+UnlockExperimentalVMOptions",
+                   "-XX:ShenandoahGCMode=generational"}): "ShenandoahGC-Gen",
+        frozenset({"-XX:+UnlockExperimentalVMOptions", "-XX:+UseEpsilonGC"}): "EpsilonGC",
+    }
+
+    # 不在GC_NAMES中的参数组合按以下顺序逐个匹配GC开关
+    GC_FLAG_NAMES = (
+        ("-XX:+UseSerialGC", "SerialGC"),
+        ("-XX:+UseParallelGC", "ParallelGC"),
+        ("-XX:+UseParallelOldGC", "ParallelOldGC"),
+        ("-XX:+UseG1GC", "G1GC"),
+        ("-XX:+UseZGC", "ZGC"),
+        ("-XX:+UseShenandoahGC", "ShenandoahGC"),
+        ("-XX:+UseEpsilonGC", "EpsilonGC"),
+    )
+
+    def __init__(self, timeout_seconds=60, keep_gc_logs=False, max_workers=None, pin_cpus=False, dedupe=False):
         self.timeout_seconds = timeout_seconds
         self.keep_gc_logs = keep_gc_logs
+        # 同一目录名下内容完全相同的类文件只测试一次，其余复用测试结果
+        self.dedupe = dedupe
+        # 并发运行的JVM数量，默认与CPU核数一致
+        self.max_workers = max_workers or os.cpu_count() or 1
         self.runner = ClassFileRunner(timeout_seconds=timeout_seconds)
-        self.gc_analyzer = GCLogAnalyzer()
+        # 不保留GC日志时，GC日志写到临时目录中（内存文件系统空间足够时优先使用），分析完即删除；
+        # 整个临时目录在测试器被回收或进程退出时删除
+        self._gc_tmp_dir = None
+        if not keep_gc_logs:
+            self._gc_tmp_dir = tempfile.mkdtemp(prefix="gclogs_", dir=self._gc_tmp_root())
+            weakref.finalize(self, shutil.rmtree, self._gc_tmp_dir, ignore_errors=True)
+        # GC日志解析是纯CPU计算，放到独立进程池中与后续JVM运行重叠进行；
+        # 主进程是多线程的，使用spawn方式创建子进程
+        self._gc_pool = ProcessPoolExecutor(max_workers=min(4, os.cpu_count() or 1),
+                                            mp_context=multiprocessing.get_context("spawn"))
+        # 测试器被回收或进程退出时关闭进程池，不留下空闲的工作进程
+        weakref.finalize(self, self._gc_pool.shutdown)
+        # 启动时一次性解析各JDK版本的java可执行文件，运行时不再切换jenv
+        self.java_bins = self._resolve_java_bins()
+        # 只保留已安装的JDK版本，测试时不再逐个类文件检查缺失的JDK
+        self._active_configs = {
+            jdk_version: jvm_params_list
+            for jdk_version, jvm_params_list in self.JDK_CONFIGS.items()
+            if jdk_version in self.java_bins
+        }
+        for jdk_version in self.JDK_CONFIGS:
+            if jdk_version not in self._active_configs:
+                logger.info(f"  跳过 {jdk_version} 的测试")
+        # 所有JVM子进程都由一个后台线程中的事件循环等待，不再为每个运行中的JVM占用一个线程
+        self._loop = asyncio.new_event_loop()
+        if sys.version_info < (3, 8) and threading.current_thread() is threading.main_thread():
+            # Python 3.8之前的子进程监视器依赖主线程事件循环上的SIGCHLD处理器，
+            # 在主线程中把监视器绑定到后台事件循环，才能在该循环中创建子进程
+            # 先替换监视器再绑定：替换时旧监视器会被关闭并移除进程全局的SIGCHLD处理器
+            watcher = asyncio.SafeChildWatcher()
+            asyncio.set_child_watcher(watcher)
+            watcher.attach_loop(self._loop)
+        threading.Thread(target=self._loop.run_forever, name="jvm-event-loop", daemon=True).start()
+        # 已确认存在的输出目录，避免对同一目录重复mkdir
+        self._created_dirs = set()
+        # 后台写JSON结果的队列，扫描目录时才启用
+        self._write_queue = None
+        # 可选：把每个JVM固定到一个CPU上，同时运行的JVM使用不同的CPU
+        self._cpu_ids = sorted(os.sched_getaffinity(0)) if pin_cpus and hasattr(os, "sched_getaffinity") else None
+        # JVM运行槽位：取到槽位才能启动JVM，限制同时运行的JVM数量；槽位编号同时决定绑定的CPU。
+        # Python 3.10之前asyncio.Queue在创建时绑定当前线程的事件循环，必须在事件循环线程中创建
+        self._jvm_slots = asyncio.run_coroutine_threadsafe(self._create_jvm_slots(), self._loop).result()
+
+    async def _create_jvm_slots(self) -> asyncio.Queue:
+        """
+        在事件循环线程中创建JVM运行槽位队列，放入编号0到max_workers-1的槽位
+        """
+        slots = asyncio.Queue()
+        for slot in range(self.max_workers):
+            slots.put_nowait(slot)
+        return slots
 
-    def switch_jdk(self, jdk_version: str) -> bool:
+    def _gc_tmp_root(self) -> Optional[str]:
         """
-        使用jenv切换JDK版本
+        返回临时GC日志目录的根目录
 
-        Args:
-            jdk_version: JDK版本名称，如 "1.8", "11"等
+        内存文件系统的剩余空间足够所有同时运行的JVM写满GC日志时使用它，否则返回None使用磁盘上的系统临时目录：
+        GC日志写满文件系统时HotSpot只会截断日志而不会让运行失败，解析出的GC指标会悄悄出错
+        """
+        tmp_root = self.runner.tmp_root
+        if tmp_root is None:
+            return None
+        try:
+            fs_stat = os.statvfs(tmp_root)
+        except OSError:
+            return None
+        if fs_stat.f_bavail * fs_stat.f_frsize < self.max_workers * _GC_LOG_BYTES_PER_JVM:
+            logger.info(f"  {tmp_root} 剩余空间不足，GC日志写到磁盘上的临时目录")
+            return None
+        return tmp_root
+
+    def _log(self, *lines: str):
+        """
+        输出一组连续的信息，作为一条日志记录写出，避免多线程下多行信息交错
+        """
+        logger.info("\n".join(lines))
+
+    def _resolve_java_bins(self) -> Dict[str, str]:
+        """
+        解析每个JDK版本对应的java可执行文件路径
+
+        优先使用环境变量 JDK{版本}_HOME（如 JDK17_HOME），否则通过 `jenv prefix` 查询
 
         Returns:
-            bool: 切换是否成功
+            Dict[str, str]: JDK版本到java可执行文件绝对路径的映射，未找到的版本不在其中
         """
-        try:
-            result = subprocess.run(
-                ["jenv", "local", jdk_version],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
+        java_bins = {}
+        jenv_available = True
+
+        for jdk_version in self.JDK_CONFIGS:
+            java_home = os.environ.get(f"JDK{jdk_version}_HOME")
+
+            if not java_home and jenv_available:
+                try:
+                    result = subprocess.run(
+                        ["jenv", "prefix", jdk_version],
+                        capture_output=True,
+                        text=True,
+                        timeout=10
+                    )
+                    if result.returncode == 0:
+                        java_home = result.stdout.strip()
+                except FileNotFoundError:
+                    jenv_available = False
+                except Exception as e:
+                    logger.info(f"✗ 查询JDK {jdk_version} 路径失败: {e}")
 
-            if result.returncode == 0:
-                print(f"✓ 成功切换到: {jdk_version}")
-                return True
+            if not java_home:
+                logger.info(f"✗ 未找到JDK {jdk_version}，请设置 JDK{jdk_version}_HOME 或通过jenv安装")
+                continue
+
+            java_bin = os.path.join(os.path.abspath(java_home), "bin", "java")
+            if os.access(java_bin, os.X_OK):
+                java_bins[jdk_version] = java_bin
+                logger.info(f"✓ JDK {jdk_version}: {java_bin}")
             else:
-                print(f"✗ 切换失败 {jdk_version}: {result.stderr}")
-                return False
-
-        except subprocess.TimeoutExpired:
-            print(f"✗ 切换超时: {jdk_version}")
-            return False
-        except FileNotFoundError:
-            print("✗ 未找到jenv命令，请确保jenv已安装并配置")
-            return False
-        except Exception as e:
-            print(f"✗ 切换异常 {jdk_version}: {e}")
-            return False
+                logger.info(f"✗ JDK {jdk_version} 的java不可执行: {java_bin}")
+
+        return java_bins
 
-    def get_current_jdk_version(self) -> str:
+    def _ensure_dir(self, directory: Path):
         """
-        获取当前JDK版本
+        确保目录存在，已创建过的目录不再重复调用mkdir
         """
-        try:
-            result = subprocess.run(
-                ["java", "-version"],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            # 从版本输出中提取信息
-            if "11." in result.stderr:
-                return "11"
-            elif "17." in result.stderr:
-                return "17"
-            elif "21." in result.stderr:
-                return "21"
-            elif "25." in result.stderr:
-                return "25"
-            elif "26." in result.stderr:
-                return "26"
-            elif "27." in result.stderr:
-                return "27"
-            else:
-                return "unknown"
-        except Exception as e:
-            print(f"获取JDK版本失败: {e}")
-            return "unknown"
+        if directory not in self._created_dirs:
+            directory.mkdir(parents=True, exist_ok=True)
+            self._created_dirs.add(directory)
 
-    def test_class_with_jdk_variants(self, class_file_path: Path, parent_directory: str, output_dir: str = None, log_path: str = None) -> List[Dict]:
+    def _gc_logs_dir(self, class_file_path: Path, log_path: Path, output_dir: str) -> Path:
+        """
+        返回类文件专属的GC日志目录：保留GC日志时与JSON文件在同一层，否则位于GC日志临时目录中的相同相对位置
+        """
+        gc_logs_dir = log_path.parent / f"{class_file_path.stem}.gclogs"
+        if self._gc_tmp_dir is None:
+            return gc_logs_dir
+        return Path(self._gc_tmp_dir) / gc_logs_dir.relative_to(output_dir)
+
+    def _slot_cpu(self, slot: int) -> Optional[int]:
+        """
+        返回JVM运行槽位绑定的CPU编号，未启用CPU绑定时返回None
+        """
+        if self._cpu_ids is None:
+            return None
+        return self._cpu_ids[slot % len(self._cpu_ids)]
+
+    @classmethod
+    def get_gc_name(cls, jvm_params: List[str]) -> str:
+        """
+        根据JVM参数获取简短的GC名称，如 "G1GC"、"ShenandoahGC-Gen"
+        """
+        gc_name = cls.GC_NAMES.get(frozenset(jvm_params))
+        if gc_name is not None:
+            return gc_name
+
+        for flag, name in cls.GC_FLAG_NAMES:
+            if flag in jvm_params:
+                if name == "ShenandoahGC" and "-XX:ShenandoahGCMode=generational" in jvm_params:
+                    return "ShenandoahGC-Gen"
+                return name
+        return "UnknownGC"
+
+    def test_class_with_jdk_variants(self, class_file_path: Path, parent_directory: str, output_dir: str = None, log_path: str = None,
+                                     run_start_ns: int = None) -> List[Dict]:
         """
         在所有的JDK版本和JVM参数组合下测试单个类文件
 
+        Args:
+            run_start_ns: 本类文件测试开始时的time.monotonic_ns()，结果中的t_offset_ms相对于它计算
+
         Returns:
             List[Dict]: 所有测试结果列表
         """
-        class_results = []
-        original_jdk = self.get_current_jdk_version()
+        if run_start_ns is None:
+            run_start_ns = time.monotonic_ns()
 
-        print(f"\n测试类文件: {class_file_path.name}")
-        print("-" * 50)
+        self._log(f"\n测试类文件: {class_file_path.name}", "-" * 50)
 
-        for jdk_version, jvm_params_list in self.JDK_CONFIGS.items():
-            print(f"\n切换到 {jdk_version}...")
+        # 所有JDK版本和GC参数组合互不依赖，全部交给事件循环并发运行
+        runs = []
+        for jdk_version, jvm_params_list in self._active_configs.items():
+            java_bin = self.java_bins[jdk_version]
+            for jvm_params in jvm_params_list:
+                runs.append(self._run_one(
+                    class_file_path, parent_directory, jdk_version, jvm_params,
+                    output_dir=output_dir, log_path=log_path, java_bin=java_bin,
+                    run_start_ns=run_start_ns
+                ))
 
-            # 切换JDK版本
-            if not self.switch_jdk(jdk_version):
-                print(f"  跳过 {jdk_version} 的测试")
-                continue
+        # gather按提交顺序返回结果，保持JSON中结果的原有顺序
+        results = asyncio.run_coroutine_threadsafe(self._gather(runs), self._loop).result()
 
-            for jvm_params in jvm_params_list:
-                print(f"  使用JVM参数: {' '.join(jvm_params)}")
-
-                # 生成GC日志文件名
-                gc_log_file = None
-                if  output_dir:
-                    # 根据GC参数生成简短的GC名称
-                    gc_name = "UnknownGC"
-                    if "-XX:+UseSerialGC" in jvm_params:
-                        gc_name = "SerialGC"
-                    elif "-XX:+UseParallelGC" in jvm_params:
-                        gc_name = "ParallelGC"
-                    elif "-XX:+UseParallelOldGC" in jvm_params:
-                        gc_name = "ParallelOldGC"
-                    elif "-XX:+UseG1GC" in jvm_params:
-                        gc_name = "G1GC"
-                    elif "-XX:+UseZGC" in jvm_params:
-                        gc_name = "ZGC"
-                    elif "-XX:+UseShenandoahGC" in jvm_params:
-                        if "-XX:ShenandoahGCMode=generational" in jvm_params:
-                            gc_name = "ShenandoahGC-Gen"
-                        else:
-                            gc_name = "ShenandoahGC"
-                    elif "-XX:+UseEpsilonGC" in jvm_params:
-                        gc_name = "EpsilonGC"
-                    
-                    # 创建每个测试用例专属的GC日志目录，与JSON文件在同一层
-                    class_filename_without_ext = class_file_path.stem
-                    
-                    # GC日志目录应该与JSON文件在同一目录下
-                    
-                    gc_logs_dir = log_path.parent / f"{class_filename_without_ext}.gclogs"
-                    gc_logs_dir.mkdir(parents=True, exist_ok=True)
-                    gc_log_file = gc_logs_dir / f"jdk{jdk_version}-{gc_name}.log"
+        # 类文件路径、包名和类名对所有组合都相同，只在class_file_info中记录一次
+        class_results = []
+        for result in results:
+            if result is not None:
+                for key in ("class_file", "package", "class_name"):
+                    result.pop(key, None)
+                class_results.append(result)
+        return class_results
 
-                try:
-                    # 使用ClassFileRunner测试类文件
-                    result = self.runner.test_class_file(
-                        class_file_path,
-                        parent_directory,
-                        jvm_args=jvm_params,
-                        enable_gc_logging=True,
-                        gc_log_file=str(gc_log_file) if gc_log_file else None
-                    )
+    @staticmethod
+    async def _gather(runs: List) -> List:
+        """
+        在事件循环中并发等待一组运行，按传入顺序返回结果
+        """
+        return await asyncio.gather(*runs)
 
-                    # 添加JDK和JVM参数信息
-                    result["jdk_version"] = jdk_version
-                    result["GC_parameters"] = jvm_params  # 重命名字段
-                    result["test_timestamp"] = datetime.now().isoformat()
-
-                    # 分析GC日志并添加到结果中
-                    if gc_log_file and result["success"]:
-                        try:
-                            # 分析GC日志
-                            gc_analysis = self.gc_analyzer.parse_gc_log(str(gc_log_file))
-                            result["gc_analysis"] = gc_analysis
-                            print(f"    📊 GC分析: {gc_analysis['total_gc_count']}次GC, STW {gc_analysis['gc_stw_time_ms']}ms, 最大堆 {gc_analysis['max_heap_mb']}MB")
-                        except Exception as e:
-                            print(f"    ⚠ GC日志分析失败: {e}")
-                            result["gc_analysis"] = {
-                                "total_gc_count": 0,
-                                "gc_stw_time_ms": 0.0,
-                                "max_stw_time_ms": 0.0,
-                                "max_heap_mb": 0,
-                                "gc_type_breakdown": {},
-                                "analysis_error": str(e)
-                            }
-
-                    # 对epsilonGC，仅计入执行成功的情况
-                    if "-XX:+UseEpsilonGC" in jvm_params and not result["success"]:
-                        print(f"    ⚠ Epsilon GC 测试失败，跳过记录")
-                        continue
-
-                    class_results.append(result)
-
-                    status = "✓ 成功" if result["success"] else "✗ 失败"
-                    print(f"    {status} | 退出码: {result['exit_code']} | 耗时: {result['duration_ms']}ms")
+    async def _run_one(self, class_file_path: Path, parent_directory: str, jdk_version: str,
+                 jvm_params: List[str], output_dir: str = None, log_path: Path = None,
+                 java_bin: str = None, run_start_ns: int = 0) -> Dict:
+        """
+        在指定JDK版本和JVM参数下运行一次测试
 
-                except Exception as e:
-                    print(f"    ✗ 测试异常: {e}")
-                    error_result = {
-                        "class_file": str(class_file_path),
-                        "package": "",
-                        "class_name": class_file_path.stem,
-                        "success": False,
-                        "output": f"Test execution error: {str(e)}",
-                        "exit_code": -1,
-                        "duration_ms": 0,
-                        "jdk_version": jdk_version,
-                        "GC_parameters": jvm_params,  # 重命名字段
-                        "full_cmd": "",  # 异常情况下无完整命令
-                        "test_timestamp": datetime.now().isoformat()
-                    }
-                    # 对epsilonGC，仅计入执行成功的情况
-                    if "-XX:+UseEpsilonGC" not in jvm_params:
-                        class_results.append(error_result)
-                    else:
-                        print(f"    ⚠ Epsilon GC 测试异常，跳过记录")
+        Returns:
+            Dict: 测试结果；Epsilon GC运行失败时返回None（不计入结果）
+        """
+        messages = [f"  使用JVM参数: {' '.join(jvm_params)}"]
+
+        # 生成GC日志文件名
+        gc_log_file = None
+        if  output_dir:
+            # 根据GC参数生成简短的GC名称
+            gc_name = self.get_gc_name(jvm_params)
+            
+            # 创建每个测试用例专属的GC日志目录
+            gc_logs_dir = self._gc_logs_dir(class_file_path, log_path, output_dir)
+            self._ensure_dir(gc_logs_dir)
+            gc_log_file = gc_logs_dir / f"jdk{jdk_version}-{gc_name}.log"
+
+        slot = await self._jvm_slots.get()
+        try:
+            # 使用ClassFileRunner测试类文件
+            result = await self.runner.test_class_file_async(
+                class_file_path,
+                parent_directory,
+                jvm_args=jvm_params,
+                enable_gc_logging=True,
+                gc_log_file=str(gc_log_file) if gc_log_file else None,
+                java_bin=java_bin,
+                cpu_affinity=self._slot_cpu(slot)
+            )
 
-        # 切换回原始JDK
-        if original_jdk != "unknown":
-            self.switch_jdk(original_jdk)
+            if gc_log_file and self._gc_tmp_dir is not None and result.get("full_cmd"):
+                # 临时GC日志分析完即删除，命令中记录GC日志在输出目录中的逻辑路径，便于复现
+                logical_log_file = Path(output_dir) / gc_log_file.relative_to(self._gc_tmp_dir)
+                result["full_cmd"] = result["full_cmd"].replace(str(gc_log_file), str(logical_log_file))
 
-        return class_results
+            # 添加JDK和JVM参数信息
+            result["jdk_version"] = jdk_version
+            result["GC_parameters"] = jvm_params  # 重命名字段
+            result["t_offset_ms"] = (time.monotonic_ns() - run_start_ns) // 1_000_000
+
+            # 提交GC日志分析任务，结果在生成JSON时收集
+            if gc_log_file and result["success"]:
+                result["_gc_future"] = self._gc_pool.submit(parse_gc_log_file, str(gc_log_file))
+
+            # 对epsilonGC，仅计入执行成功的情况
+            if "-XX:+UseEpsilonGC" in jvm_params and not result["success"]:
+                messages.append(f"    ⚠ Epsilon GC 测试失败，跳过记录")
+                return None
 
-    def generate_log_content(self, results: List[Dict]) -> str:
+            status = "✓ 成功" if result["success"] else "✗ 失败"
+            messages.append(f"    {status} | 退出码: {result['exit_code']} | 耗时: {result['duration_ms']}ms")
+            return result
+
+        except Exception as e:
+            messages.append(f"    ✗ 测试异常: {e}")
+            error_result = {
+                "success": False,
+                "output": f"Test execution error: {str(e)}",
+                "exit_code": -1,
+                "duration_ms": 0,
+                "jdk_version": jdk_version,
+                "GC_parameters": jvm_params,  # 重命名字段
+                "full_cmd": "",  # 异常情况下无完整命令
+                "t_offset_ms": (time.monotonic_ns() - run_start_ns) // 1_000_000
+            }
+            # 对epsilonGC，仅计入执行成功的情况
+            if "-XX:+UseEpsilonGC" not in jvm_params:
+                return error_result
+            messages.append(f"    ⚠ Epsilon GC 测试异常，跳过记录")
+            return None
+
+        finally:
+            self._jvm_slots.put_nowait(slot)
+            self._log(*messages)
+
+    def generate_log_content(self, results: List[Dict], test_start_time: str = "",
+                             class_file_info: Dict = None) -> bytes:
         """
         生成.log文件内容（JSON格式）
 
         Args:
             results: 单个类文件的所有测试结果
+            test_start_time: 本类文件测试开始的时间（ISO格式），各结果的t_offset_ms相对于它
+            class_file_info: 类文件信息（file_path、package、class_name）；未提供时从第一个结果中读取
 
         Returns:
-            str: .log文件内容（JSON格式）
+            bytes: .log文件内容（UTF-8编码的JSON）
         """
+        if class_file_info is None:
+            first = results[0] if results else {}
+            class_file_info = {
+                "file_path": first.get("class_file", ""),
+                "package": first.get("package", ""),
+                "class_name": first.get("class_name", ""),
+            }
+
         # 构建结构化的日志数据
         log_data = {
-            "class_file_info": {
-                "file_path": results[0]["class_file"] if results else "",
-                "package": results[0]["package"] if results else "",
-                "class_name": results[0]["class_name"] if results else "",
-            },
-            "test_summary": {
-                "total_tests": len(results),
-                "successful_tests": sum(1 for r in results if r["success"]),
-                "failed_tests": sum(1 for r in results if not r["success"]),
-                "success_rate": round((sum(1 for r in results if r["success"]) / len(results) * 100),
-                                      2) if results else 0
-            },
+            "class_file_info": class_file_info,
+            "test_start_time": test_start_time,
+            "test_summary": {},
             "test_results": []
         }
 
-        # 添加每个测试环境的详细结果
+        # 添加每个测试环境的详细结果，同时统计成功次数
+        successful_tests = 0
         for result in results:
+            if result["success"]:
+                successful_tests += 1
+            self._collect_gc_analysis(result)
             test_result = {
                 "jdk_version": result["jdk_version"],
                 "GC_parameters": result["GC_parameters"],
@@ -307,12 +473,45 @@ class JDKDifferentialTester:
                 "duration_ms": result["duration_ms"],
                 "output": result["output"],
                 "gc_analysis": result.get("gc_analysis", {}),
-                "test_timestamp": result.get("test_timestamp", "")
+                "t_offset_ms": result.get("t_offset_ms", 0)
             }
             log_data["test_results"].append(test_result)
 
-        # 将JSON数据格式化为易读的字符串
-        return json.dumps(log_data, indent=2, ensure_ascii=False)
+        total_tests = len(results)
+        log_data["test_summary"] = {
+            "total_tests": total_tests,
+            "successful_tests": successful_tests,
+            "failed_tests": total_tests - successful_tests,
+            "success_rate": round((successful_tests / total_tests * 100), 2) if total_tests else 0
+        }
+
+        # 将JSON数据格式化为易读的字节串
+        return _dumps_json(log_data)
+
+    def _collect_gc_analysis(self, result: Dict):
+        """
+        等待后台GC日志分析完成，并把分析结果写入result["gc_analysis"]
+        """
+        gc_future = result.pop("_gc_future", None)
+        if gc_future is None:
+            return
+
+        try:
+            # 分析GC日志
+            gc_analysis = gc_future.result()
+            result["gc_analysis"] = gc_analysis
+            self._log(f"    📊 GC分析 (JDK {result['jdk_version']} {' '.join(result['GC_parameters'])}): "
+                      f"{gc_analysis['total_gc_count']}次GC, STW {gc_analysis['gc_stw_time_ms']}ms, 最大堆 {gc_analysis['max_heap_mb']}MB")
+        except Exception as e:
+            self._log(f"    ⚠ GC日志分析失败: {e}")
+            result["gc_analysis"] = {
+                "total_gc_count": 0,
+                "gc_stw_time_ms": 0.0,
+                "max_stw_time_ms": 0.0,
+                "max_heap_mb": 0,
+                "gc_type_breakdown": {},
+                "analysis_error": str(e)
+            }
 
     def scan_and_test_directory(self, base_dir: str, output_dir: str):
         """
@@ -322,88 +521,214 @@ class JDKDifferentialTester:
             base_dir: 输入目录，包含.class文件
             output_dir: 输出目录，用于保存.log文件
         """
+        # 规范化一次基目录，遍历目录树和计算相对路径都使用同一个路径，避免a/../b这类路径无法计算相对路径
+        base_dir = os.path.normpath(base_dir)
         base_path = Path(base_dir)
         output_path = Path(output_dir)
 
-        print(f"开始扫描目录: {base_dir}")
-        print(f"输出目录: {output_dir}")
-        print("=" * 60)
+        logger.info(f"开始扫描目录: {base_dir}")
+        logger.info(f"输出目录: {output_dir}")
+        logger.info("=" * 60)
 
         # 确保输出目录存在
         output_path.mkdir(parents=True, exist_ok=True)
 
-        total_files = 0
-        for item in base_path.rglob('*'):
-            if item.is_file() and item.suffix == '.class':
-                # 获取父目录名
-                parent_dir = item.parent.name
-
-                # 跳过以@结尾的目录（可能是临时目录）
-                if parent_dir.endswith('@'):
-                    continue
-
-                total_files += 1
-
-        print(f"找到 {total_files} 个类文件")
-        print("开始差分测试...")
-
-        current_file = 0
-        for item in base_path.rglob('*'):
-            if item.is_file() and item.suffix == '.class':
-                # 获取父目录名
-                parent_dir = item.parent.name
-
-                # 跳过以@结尾的目录（可能是临时目录）
-                if parent_dir.endswith('@'):
-                    continue
-
-                current_file += 1
-                print(f"\n[{current_file}/{total_files}] ", end="")
-
-                # 计算相对于基目录的相对路径
-                relative_path = item.relative_to(base_path)
-
-                # 构建对应的.log文件路径
-                log_file_path = output_path / relative_path.with_suffix('.json')
-
-                # 确保输出目录存在
-                log_file_path.parent.mkdir(parents=True, exist_ok=True)
-                # 在所有JDK版本和JVM参数组合下测试这个类文件
-                class_results = self.test_class_with_jdk_variants(item, parent_dir, output_dir,log_file_path)
-
-                
-                # 生成并写入.log文件内容
-                log_content = self.generate_log_content(class_results)
-                with open(log_file_path, 'w', encoding='utf-8') as f:
-                    f.write(log_content)
-
-                print(f"  结果已保存: {log_file_path}")
-                # 定时清理GC日志
-                if (not self.keep_gc_logs):
-                    self._cleanup_gc_logs(log_file_path.parent)
-
-        print(f"\n测试完成! 共测试 {total_files} 个类文件")
-        print(f"结果已保存到: {output_dir}")
-        
-        
-    
-    def _cleanup_gc_logs(self, output_path: Path):
-        """
-        清理所有GC日志文件
-        
+        # 只遍历一次目录树，收集所有待测类文件
+        class_files = list(self._iter_class_files(base_dir))
+        total_files = len(class_files)
+
+        logger.info(f"找到 {total_files} 个类文件")
+        logger.info("开始差分测试...")
+
+        # 启动后台写线程，测试线程只负责把结果放入队列，不等待磁盘写入
+        self._write_queue = queue.Queue(maxsize=self.max_workers * 2)
+        writer = threading.Thread(target=self._write_results, args=(self._write_queue,),
+                                  name="result-writer", daemon=True)
+        writer.start()
+
+        # 多个类文件并发测试；信号量限制同时在测的类文件数量，避免一次性提交所有任务
+        in_flight = threading.BoundedSemaphore(self.max_workers)
+        futures = []
+        # (类文件内容哈希, 父目录名) -> (首个类文件路径, 其JSON写入完成的Future)
+        seen = {}
+        # 启用去重时各首个类文件的(测试任务的Future, 其JSON写入完成的Future)
+        originals = []
+        class_pool = ThreadPoolExecutor(max_workers=self.max_workers)
+        try:
+            try:
+                for current_file, (item, parent_dir) in enumerate(class_files, start=1):
+                    # 计算相对于基目录的相对路径
+                    relative_path = item.relative_to(base_path)
+
+                    # 构建对应的.log文件路径
+                    log_file_path = output_path / relative_path.with_suffix('.json')
+
+                    progress = f"[{current_file}/{total_files}]"
+                    in_flight.acquire()
+                    # 包名和类名由父目录名决定，因此内容相同且父目录名相同的类文件测试结果一致
+                    key = (self._hash_class_file(item), parent_dir) if self.dedupe else None
+                    if key in seen:
+                        original, written = seen[key]
+                        future = class_pool.submit(self._save_duplicate, item, original, written,
+                                                   log_file_path, progress)
+                    else:
+                        written = Future()
+                        future = class_pool.submit(self._test_and_save, item, parent_dir, output_dir,
+                                                   log_file_path, progress, written)
+                        if key is not None:
+                            seen[key] = (item, written)
+                            originals.append((future, written))
+                    future.add_done_callback(lambda _: in_flight.release())
+                    futures.append(future)
+                # 等待所有类文件测试完成
+                class_pool.shutdown()
+            except KeyboardInterrupt:
+                # JVM运行在独立的进程组中，收不到终端的Ctrl-C：立即杀掉正在运行的JVM并停止启动新的JVM，
+                # 取消尚未开始的类文件，不等待线程池中仍在收尾的任务
+                self.runner.kill_running_processes()
+                for future in futures:
+                    future.cancel()
+                # 首个类文件的测试被取消时同时取消其写入Future，等待复用其结果的重复类文件不再阻塞
+                for future, written in originals:
+                    if future.cancelled():
+                        written.cancel()
+                class_pool.shutdown(wait=False)
+                self._gc_pool.shutdown(wait=False)
+                raise
+        finally:
+            # 等待已提交的结果写入磁盘后再退出
+            self._write_queue.put(None)
+            writer.join()
+            self._write_queue = None
+
+        # 传播工作线程中的异常
+        for future in futures:
+            future.result()
+
+        logger.info(f"\n测试完成! 共测试 {total_files} 个类文件")
+        logger.info(f"结果已保存到: {output_dir}")
+
+    def _iter_class_files(self, base_dir: str):
+        """
+        遍历目录树，逐个返回(类文件路径, 父目录名)
+
+        使用os.walk处理原始字符串，只为.class文件构造Path对象；base_dir须已规范化
+        """
+        for root, dirs, files in os.walk(base_dir):
+            # 获取父目录名
+            parent_dir = os.path.basename(root)
+
+            # 跳过以@结尾的目录（可能是临时目录）
+            if parent_dir.endswith('@'):
+                continue
+
+            for filename in files:
+                if filename.endswith('.class'):
+                    yield Path(root, filename), parent_dir
+
+    @staticmethod
+    def _hash_class_file(class_file_path: Path) -> str:
+        """
+        计算类文件内容的哈希值，用于识别内容相同的类文件
+        """
+        return hashlib.blake2b(class_file_path.read_bytes(), digest_size=16).hexdigest()
+
+    def _save_duplicate(self, item: Path, original: Path, written: Future, log_file_path: Path, progress: str):
+        """
+        为内容重复的类文件复用首个相同类文件的测试结果，不再运行JVM
+        """
+        self._log(f"\n{progress} ", f"  {item.name} 与 {original} 内容相同，复用其测试结果")
+
+        # 等待首个类文件的结果写入完成
+        original_log_path = written.result()
+        log_data = _loads_json(original_log_path.read_bytes())
+        log_data["class_file_info"]["file_path"] = str(item)
+        log_data["duplicate_of"] = str(original)
+
+        self._ensure_dir(log_file_path.parent)
+        self._save_log_content(log_file_path, _dumps_json(log_data))
+
+    def _test_and_save(self, item: Path, parent_dir: str, output_dir: str, log_file_path: Path, progress: str,
+                       written: Future = None):
+        """
+        测试单个类文件并写入其JSON结果，在类文件线程池中运行
+
         Args:
-            output_path: 输出目录路径
+            written: 如果提供，JSON写入完成后设置为其路径，供内容重复的类文件复用
         """
-        import glob
-        gc_log_files = list(output_path.rglob("*.log"))
-        if gc_log_files:
-            print(f"清理 {len(gc_log_files)} 个GC日志文件...")
-            for log_file in gc_log_files:
-                try:
-                    log_file.unlink()
-                except Exception as e:
-                    print(f"  删除 {log_file} 失败: {e}")
-            print("GC日志文件清理完成")
+        try:
+            self._run_and_save(item, parent_dir, output_dir, log_file_path, progress, written)
+        except BaseException as e:
+            if written is not None and not written.done():
+                written.set_exception(e)
+            raise
+
+    def _run_and_save(self, item: Path, parent_dir: str, output_dir: str, log_file_path: Path, progress: str,
+                      written: Future = None):
+        self._log(f"\n{progress} ")
+
+        # 确保输出目录存在
+        self._ensure_dir(log_file_path.parent)
+        # 每个类文件只格式化一次墙钟时间，各结果记录相对它的毫秒偏移
+        test_start_time = datetime.now().isoformat()
+        run_start_ns = time.monotonic_ns()
+
+        # 在所有JDK版本和JVM参数组合下测试这个类文件
+        class_results = self.test_class_with_jdk_variants(item, parent_dir, output_dir, log_file_path,
+                                                          run_start_ns=run_start_ns)
+        # 测试期间被用户中断时，部分组合没有真正运行，不写出不完整的结果
+        if self.runner.interrupted:
+            raise CancelledError()
+
+        # 生成.log文件内容，交给后台线程写入
+        package_name, class_name = self.runner.extract_package_and_classname(parent_dir, item.name)
+        class_file_info = {"file_path": str(item), "package": package_name, "class_name": class_name}
+        log_content = self.generate_log_content(class_results, test_start_time, class_file_info)
+        self._save_log_content(log_file_path, log_content, written)
+        # 清理GC日志；整体删除本类文件的GC日志目录，不影响同目录下仍在运行的其他类文件
+        if (not self.keep_gc_logs):
+            gc_logs_dir = self._gc_logs_dir(item, log_file_path, output_dir)
+            shutil.rmtree(gc_logs_dir, ignore_errors=True)
+            self._created_dirs.discard(gc_logs_dir)
+
+    def _save_log_content(self, log_file_path: Path, log_content: bytes, written: Future = None):
+        """
+        保存JSON结果：扫描目录时交给后台写线程，否则直接写入
+        """
+        if self._write_queue is not None:
+            self._write_queue.put((log_file_path, log_content, written))
+        else:
+            self._write_result(log_file_path, log_content, written)
+
+    def _write_result(self, log_file_path: Path, log_content: bytes, written: Future = None):
+        """
+        将一个类文件的JSON结果写入磁盘
+        """
+        try:
+            with open(log_file_path, 'wb') as f:
+                f.write(log_content)
+        except Exception as e:
+            if written is not None:
+                written.set_exception(e)
+            raise
+
+        self._log(f"  结果已保存: {log_file_path}")
+        if written is not None:
+            written.set_result(log_file_path)
+
+    def _write_results(self, write_queue: queue.Queue):
+        """
+        后台写线程：依次写入队列中的结果，收到None时退出
+        """
+        while True:
+            item = write_queue.get()
+            if item is None:
+                break
+            log_file_path, log_content, written = item
+            try:
+                self._write_result(log_file_path, log_content, written)
+            except Exception as e:
+                self._log(f"  写入 {log_file_path} 失败: {e}")
 
 
 def main():
@@ -419,28 +744,42 @@ def main():
                         help='测试超时时间（秒），默认60秒')
     parser.add_argument('--keep-gc-logs', action='store_true',
                         help='保留GC日志文件到输出目录')
+    parser.add_argument('-w', '--workers', type=int, default=None,
+                        help='并发运行的JVM数量，默认等于CPU核数')
+    parser.add_argument('--pin-cpus', action='store_true',
+                        help='将每个并发运行的JVM绑定到不同的CPU（需要taskset；会减少JVM可见的CPU数，影响GC线程数）')
+    parser.add_argument('--dedupe', action='store_true',
+                        help='同一目录名下内容重复的类文件只测试一次，其余复用测试结果（结果中记录duplicate_of）')
 
 
     args = parser.parse_args()
 
-    if not os.path.exists(args.input_dir):
-        print(f"错误: 输入目录 '{args.input_dir}' 不存在")
-        sys.exit(1)
+    listener = setup_logging()
+    try:
+        if not os.path.exists(args.input_dir):
+            logger.info(f"错误: 输入目录 '{args.input_dir}' 不存在")
+            sys.exit(1)
 
-    # 创建测试器
-    tester = JDKDifferentialTester(timeout_seconds=args.timeout, keep_gc_logs=args.keep_gc_logs)
+        # 创建测试器
+        tester = JDKDifferentialTester(timeout_seconds=args.timeout, keep_gc_logs=args.keep_gc_logs,
+                                       max_workers=args.workers, pin_cpus=args.pin_cpus,
+                                       dedupe=args.dedupe)
 
-    try:
-        # 执行差分测试
-        tester.scan_and_test_directory(args.input_dir, args.output_dir)
+        try:
+            # 执行差分测试
+            tester.scan_and_test_directory(args.input_dir, args.output_dir)
 
 
 
-    except KeyboardInterrupt:
-        print("\n测试被用户中断")
-    except Exception as e:
-        print(f"测试过程中发生错误: {e}")
-        sys.exit(1)
+        except KeyboardInterrupt:
+            logger.info("\n测试被用户中断")
+            tester.runner.kill_running_processes()
+        except Exception as e:
+            logger.info(f"测试过程中发生错误: {e}")
+            sys.exit(1)
+    finally:
+        # 写出队列中剩余的日志
+        listener.stop()
 
 
 if __name__ == "__main__":
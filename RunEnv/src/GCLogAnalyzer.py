@@ -3,47 +3,66 @@
 GC日志分析器 - 解析Java GC日志文件并提取关键性能指标
 """
 
+import mmap
 import re
 import os
-from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+import threading
+from typing import Dict
 try:
-    from GCLogParser import (
-        BaseGCParser,
-        SerialGCParser,
-        ParallelGCParser,
-        G1GCParser,
-        ZGCParser,
-        ShenandoahGCParser,
-        EpsilonGCParser
-    )
+    import GCLogParser
+    from GCLogParser import BaseGCParser
 except ImportError:
     # 如果作为模块导入失败，尝试相对导入
-    from .GCLogParser import (
-        BaseGCParser,
-        SerialGCParser,
-        ParallelGCParser,
-        G1GCParser,
-        ZGCParser,
-        ShenandoahGCParser,
-        EpsilonGCParser
-    )
+    from . import GCLogParser
+    from .GCLogParser import BaseGCParser
+
+
+# 文件名中的GC类型关键字 -> 解析器类名
+_GC_PARSER_CLASSES = {
+    'serialgc': 'SerialGCParser',
+    'parallelgc': 'ParallelGCParser',
+    'paralleloldgc': 'ParallelGCParser',  # ParallelOldGC使用ParallelGC的解析器
+    'g1gc': 'G1GCParser',
+    'zgc': 'ZGCParser',
+    'shenandoahgc': 'ShenandoahGCParser',
+    'epsilongc': 'EpsilonGCParser',
+}
+# 文件名中的GC类型和JDK版本，一次扫描即可识别
+_GC_TYPE_PATTERN = re.compile('|'.join(_GC_PARSER_CLASSES))
+_JDK_VERSION_PATTERN = re.compile(r'jdk(\d+)')
+
+
+# 每个线程缓存一组解析器实例，同一线程中创建的GCLogAnalyzer共享这组解析器
+_thread_parsers = threading.local()
+
+
+def _get_thread_parsers() -> Dict[str, BaseGCParser]:
+    """
+    返回当前线程的解析器缓存（GC类型 -> 解析器实例），首次调用时创建
+
+    解析器带有可变的统计状态，不能跨线程共享；同一线程内每次解析前都会reset，可以安全复用
+    """
+    parsers = getattr(_thread_parsers, 'parsers', None)
+    if parsers is None:
+        parsers = {}
+        _thread_parsers.parsers = parsers
+    return parsers
 
 
 class GCLogAnalyzer:
     def __init__(self):
         """
-        初始化各种实现好的针对某一GC类型的GC日志的解析器
+        获取按线程缓存的GC日志解析器，解析器在首次遇到对应GC类型的日志时才创建
         """
-        self.gc_parsers = {
-            'serialgc': SerialGCParser(),
-            'parallelgc': ParallelGCParser(),
-            'paralleloldgc': ParallelGCParser(),  # ParallelOldGC使用ParallelGC的解析器
-            'g1gc': G1GCParser(),
-            'zgc': ZGCParser(),
-            'shenandoahgc': ShenandoahGCParser(),
-            'epsilongc': EpsilonGCParser(),
-        }
+        self.gc_parsers = _get_thread_parsers()
+
+    def get_parser(self, gc_type: str) -> BaseGCParser:
+        """返回指定GC类型的解析器，首次使用时导入对应子模块并创建实例"""
+        parser = self.gc_parsers.get(gc_type)
+        if parser is None:
+            parser = getattr(GCLogParser, _GC_PARSER_CLASSES[gc_type])()
+            self.gc_parsers[gc_type] = parser
+        return parser
     
     def parse_gc_log(self, gc_log_file: str) -> Dict[str, any]:
         """
@@ -62,31 +81,24 @@ class GCLogAnalyzer:
                 "gc_type_breakdown": Dict[str, Dict[str, any]] #GC类型细分次数
             }
         """
-        # 检查文件是否存在
-        if not os.path.exists(gc_log_file):
-            raise FileNotFoundError(f"GC日志文件不存在: {gc_log_file}")
-        
-        # 基于文件名判断GC类型和JDK版本
-        gc_log_filename = Path(gc_log_file).name.lower()
+        # 基于文件名判断GC类型和JDK版本（文件是否存在由下面的open检查）
+        gc_log_filename = os.path.basename(gc_log_file).lower()
         
         # 提取JDK版本
         jdk_version = None
-        jdk_match = re.search(r'jdk(\d+)', gc_log_filename)
+        jdk_match = _JDK_VERSION_PATTERN.search(gc_log_filename)
         if jdk_match:
             jdk_version = int(jdk_match.group(1))
         
         # 检测GC类型
-        gc_type = None
-        for type_key in self.gc_parsers.keys():
-            if type_key in gc_log_filename:
-                gc_type = type_key
-                break
-        
-        if gc_type is None:
+        gc_type_match = _GC_TYPE_PATTERN.search(gc_log_filename)
+        if gc_type_match is None:
             raise ValueError(f"无法从文件名 '{gc_log_filename}' 中识别GC类型")
         
+        gc_type = gc_type_match.group()
+        
         # 获取对应的解析器
-        parser = self.gc_parsers[gc_type]
+        parser = self.get_parser(gc_type)
         
         # 如果是ZGC解析器且有JDK版本信息，设置JDK版本
         if gc_type == 'zgc' and jdk_version is not None:
@@ -95,12 +107,19 @@ class GCLogAnalyzer:
         # 重置解析器状态
         parser.reset()
         
-        # 读取并解析日志文件
+        # 读取并解析日志文件：mmap映射整个文件，GC ID和日志内容都直接在字节上整体扫描
         try:
-            with open(gc_log_file, 'r', encoding='utf-8') as f:
-                for line in f:
-                    parser.record_gc_id(line)
-                    parser.parse_log_line(line)
+            with open(gc_log_file, 'rb') as f:
+                # 空文件无法mmap，也没有需要解析的内容
+                if os.fstat(f.fileno()).st_size:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        # 提示内核按顺序预读（仅部分平台支持）
+                        if hasattr(mmap, 'MADV_SEQUENTIAL'):
+                            mm.madvise(mmap.MADV_SEQUENTIAL)
+                        parser.record_gc_ids(mm)
+                        parser.parse_buffer(mm)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"GC日志文件不存在: {gc_log_file}") from None
         except Exception as e:
             raise RuntimeError(f"读取GC日志文件时发生错误: {e}")
         
@@ -118,3 +137,19 @@ class GCLogAnalyzer:
         
         return result
     
+
+
+# 每个进程复用的分析器实例，供 parse_gc_log_file 在进程池中使用
+_process_analyzer = None
+
+
+def parse_gc_log_file(gc_log_file: str) -> Dict[str, any]:
+    """
+    解析GC日志文件，可作为进程池任务提交
+
+    每个进程懒加载一个GCLogAnalyzer并复用，进程之间不共享解析器状态
+    """
+    global _process_analyzer
+    if _process_analyzer is None:
+        _process_analyzer = GCLogAnalyzer()
+    return _process_analyzer.parse_gc_log(gc_log_file)
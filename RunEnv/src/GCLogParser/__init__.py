@@ -1,14 +1,37 @@
 """
 GC日志解析器模块
 提供不同GC类型的解析器实现
+
+各解析器子模块在首次访问对应类时才导入（PEP 562），只分析一种GC类型时无需编译其他解析器的正则
 """
+import importlib
+
 from .base_parser import BaseGCParser
-from .serial_parser import SerialGCParser
-from .parallel_parser import ParallelGCParser
-from .g1_parser import G1GCParser
-from .zgc_parser import ZGCParser
-from .shenandoah_parser import ShenandoahGCParser
-from .epsilon_parser import EpsilonGCParser
+
+# 解析器类名 -> 所在子模块
+_LAZY_PARSERS = {
+    'SerialGCParser': 'serial_parser',
+    'ParallelGCParser': 'parallel_parser',
+    'G1GCParser': 'g1_parser',
+    'ZGCParser': 'zgc_parser',
+    'ShenandoahGCParser': 'shenandoah_parser',
+    'EpsilonGCParser': 'epsilon_parser',
+}
+
+
+def __getattr__(name):
+    if name not in _LAZY_PARSERS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module(f".{_LAZY_PARSERS[name]}", __name__)
+    parser_class = getattr(module, name)
+    # 缓存到模块命名空间，之后的访问不再经过__getattr__
+    globals()[name] = parser_class
+    return parser_class
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_PARSERS))
+
 
 __all__ = [
     'BaseGCParser',
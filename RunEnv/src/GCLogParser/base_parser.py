@@ -3,20 +3,51 @@ GC日志解析器基类
 定义所有GC解析器的通用接口和基础功能
 """
 import re
+import sys
+from array import array
+from collections import defaultdict
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional, Any, Pattern
+from typing import Dict, Iterator, List, Optional, Any, Pattern
 
+# 日志中的GC ID，如 GC(12)；按字节匹配，可直接扫描mmap后的整个日志文件
+GC_ID_PATTERN = re.compile(rb'GC\((\d+)\)')
+_GC_ID_TEXT_PATTERN = re.compile(r'GC\((\d+)\)')
+
+# 堆大小：数字和可选单位，单位缺省时默认为MB
+_HEAP_SIZE_PATTERN = re.compile(r'(\d+(?:\.\d+)?)\s*(GB|MB|KB|G|M|K)?')
+# 堆大小单位 -> (乘数, 除数)，换算为MB
+_HEAP_SIZE_UNITS = {
+    'GB': (1024, 1), 'G': (1024, 1),
+    'MB': (1, 1), 'M': (1, 1), '': (1, 1),
+    'KB': (1, 1024), 'K': (1, 1024),
+}
+
+# 时间：数字和单位（"seconds"由"s"分支匹配）
+_TIME_PATTERN = re.compile(r'(\d+(?:\.\d+)?)\s*(ms|us|ns|s)')
+# 时间单位 -> (乘数, 除数)，换算为毫秒
+_TIME_UNITS = {
+    'ms': (1, 1),
+    's': (1000, 1),
+    'us': (1, 1000),
+    'ns': (1, 1000000),
+}
 
 class BaseGCParser(ABC):
     """GC日志解析器基类"""
     
+    # 行关键字的字节正则。子类设置后，parse_buffer在整个缓冲区上扫描关键字，
+    # 只把含有关键字的行解码后交给parse_log_line；parse_log_line必须对其余的行不做任何处理
+    _LINE_TRIGGER_PATTERN: Optional[Pattern] = None
+
     def __init__(self):
         self.gc_count = 0
         self.total_stw_time = 0.0
         self.max_stw_time = 0.0
         self.max_heap_usage = 0
-        self.gc_type_breakdown = {}
         self.gc_ids = set()
+        self._reset_gc_type_stats()
+        # 整体解析缓冲区时暂存的GC事件，解析结束后批量更新统计信息；为None时立即更新
+        self._deferred_gc_events = None
         
     @abstractmethod
     def get_gc_type(self) -> str:
@@ -30,6 +61,67 @@ class BaseGCParser(ABC):
         """
         pass
     
+    def parse_buffer(self, buffer: bytes):
+        """
+        解析整个日志缓冲区（bytes或mmap）
+
+        默认按通用换行符逐行解码后交给parse_log_line；子类可以覆盖为用一个合并的正则整体扫描。
+        逐行解析期间update_gc_stats只暂存事件，全部行解析完后再批量更新统计信息
+        """
+        self._deferred_gc_events = []
+        # 绑定方法存入局部变量，循环内不再逐行查找属性
+        parse_log_line = self.parse_log_line
+        if self._LINE_TRIGGER_PATTERN is None:
+            lines = self.split_lines(buffer)
+        else:
+            lines = self.iter_trigger_lines(buffer, self._LINE_TRIGGER_PATTERN)
+        try:
+            for line in lines:
+                parse_log_line(line)
+        finally:
+            gc_events, self._deferred_gc_events = self._deferred_gc_events, None
+            self.update_gc_stats_batch(gc_events)
+
+    @staticmethod
+    def split_lines(buffer: bytes) -> List[str]:
+        """
+        把整个日志缓冲区一次性解码并按通用换行符切分为行（不含换行符）
+
+        整体解码和切分都在C层完成，避免逐行读取文件和逐行解码
+        """
+        text = bytes(buffer).decode('utf-8')
+        if '\r' in text:
+            text = text.replace('\r\n', '\n').replace('\r', '\n')
+        lines = text.split('\n')
+        # 以换行符结尾的文件最后会多出一个空串
+        if lines[-1] == '':
+            lines.pop()
+        return lines
+
+    @staticmethod
+    def iter_trigger_lines(buffer: bytes, trigger_pattern: Pattern) -> Iterator[str]:
+        """
+        用finditer式的连续search在整个缓冲区上查找关键字，逐个返回关键字所在的整行（已解码，不含换行符）
+
+        不含关键字的行由正则引擎直接跳过，既不切分也不解码
+        """
+        # 统一换行符，与split_lines的切分结果保持一致（只有含\r的日志才需要复制一份）
+        if buffer.find(b'\r') >= 0:
+            buffer = bytes(buffer).replace(b'\r\n', b'\n').replace(b'\r', b'\n')
+        search = trigger_pattern.search
+        pos = 0
+        while True:
+            match = search(buffer, pos)
+            if match is None:
+                return
+            start = buffer.rfind(b'\n', 0, match.start()) + 1
+            end = buffer.find(b'\n', match.end())
+            if end < 0:
+                end = len(buffer)
+            yield buffer[start:end].decode('utf-8')
+            # 同一行中的其他关键字不必再找，从下一行继续扫描
+            pos = end + 1
+
     def extract_heap_size(self, heap_info: str) -> int:
         """
         从堆信息中提取堆大小（MB）
@@ -41,31 +133,15 @@ class BaseGCParser(ABC):
         # 移除空格并转换为大写
         heap_str = heap_info.strip().upper()
         
-        # 匹配数字和单位的模式
-        patterns = [
-            r'(\d+(?:\.\d+)?)\s*GB',  # GB单位
-            r'(\d+(?:\.\d+)?)\s*G',   # G单位
-            r'(\d+(?:\.\d+)?)\s*MB',  # MB单位  
-            r'(\d+(?:\.\d+)?)\s*M',   # M单位
-            r'(\d+(?:\.\d+)?)\s*KB',  # KB单位
-            r'(\d+(?:\.\d+)?)\s*K',   # K单位
-            r'(\d+)'                  # 纯数字，默认为MB
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, heap_str)
-            if match:
-                value = float(match.group(1))
-                unit = match.group(0).replace(match.group(1), '').strip().upper()
-                
-                if unit in ['GB', 'G']:
-                    return int(value * 1024)
-                elif unit in ['MB', 'M'] or unit == '':
-                    return int(value)
-                elif unit in ['KB', 'K']:
-                    return max(1, int(value / 1024))  # 至少1MB
-                    
-        return 0
+        match = _HEAP_SIZE_PATTERN.search(heap_str)
+        if not match:
+            return 0
+
+        multiplier, divisor = _HEAP_SIZE_UNITS[match.group(2) or '']
+        size_mb = int(float(match.group(1)) * multiplier / divisor)
+        if divisor > 1:
+            return max(1, size_mb)  # 至少1MB
+        return size_mb
     
     def extract_time_from_ms(self, time_str: str) -> float:
         """
@@ -75,33 +151,19 @@ class BaseGCParser(ABC):
         if not time_str:
             return 0.0
             
-        patterns = [
-            r'(\d+(?:\.\d+)?)\s*ms',  # 毫秒
-            r'(\d+(?:\.\d+)?)\s*s',   # 秒
-            r'(\d+(?:\.\d+)?)\s*seconds?',  # 秒(完整)
-            r'(\d+(?:\.\d+)?)\s*us',  # 微秒
-            r'(\d+(?:\.\d+)?)\s*ns'   # 纳秒
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, time_str.lower())
-            if match:
-                value = float(match.group(1))
-                unit = match.group(0).replace(match.group(1), '').strip().lower()
-                
-                if unit in ['ms']:
-                    return value
-                elif unit in ['s', 'seconds', 'second']:
-                    return value * 1000
-                elif unit in ['us']:
-                    return value / 1000
-                elif unit in ['ns']:
-                    return value / 1000000
-                    
-        return 0.0
+        match = _TIME_PATTERN.search(time_str.lower())
+        if not match:
+            return 0.0
+
+        multiplier, divisor = _TIME_UNITS[match.group(2)]
+        return float(match.group(1)) * multiplier / divisor
     
     def update_gc_stats(self, gc_subtype: str, stw_time: float, heap_before: int = 0, heap_after: int = 0):
         """更新GC统计信息"""
+        if self._deferred_gc_events is not None:
+            self._deferred_gc_events.append((gc_subtype, stw_time, heap_before, heap_after))
+            return
+
         self.gc_count += 1
         self.total_stw_time += stw_time
         self.max_stw_time = max(self.max_stw_time, stw_time)
@@ -111,19 +173,80 @@ class BaseGCParser(ABC):
         self.max_heap_usage = max(self.max_heap_usage, max_current_heap)
         
         # 更新GC类型细分统计
-        if gc_subtype not in self.gc_type_breakdown:
-            self.gc_type_breakdown[gc_subtype] = {
-                "count": 0,
-                "stw_time_ms": 0.0
-            }
-        
-        self.gc_type_breakdown[gc_subtype]["count"] += 1
-        self.gc_type_breakdown[gc_subtype]["stw_time_ms"] += stw_time
+        i = self._gc_subtype_index(gc_subtype)
+        self._counts[i] += 1
+        self._stws[i] += stw_time
     
+    def update_gc_stats_batch(self, events: List[tuple]):
+        """
+        批量更新GC统计信息，结果与按顺序逐个调用update_gc_stats相同
+
+        Args:
+            events: (gc_subtype, stw_time, heap_before, heap_after) 列表，按日志中出现的顺序排列
+        """
+        if not events:
+            return
+        subtypes, stw_times, heaps_before, heaps_after = zip(*events)
+
+        # 总和按原顺序累加，与逐个更新的浮点结果一致
+        self.gc_count += len(stw_times)
+        self.total_stw_time = sum(stw_times, self.total_stw_time)
+        self.max_stw_time = max(self.max_stw_time, max(stw_times))
+        self.max_heap_usage = max(self.max_heap_usage, max(heaps_before), max(heaps_after))
+
+        # 按GC子类型分组，保持子类型首次出现的顺序
+        times_by_subtype = defaultdict(list)
+        for gc_subtype, stw_time in zip(subtypes, stw_times):
+            times_by_subtype[gc_subtype].append(stw_time)
+        for gc_subtype, times in times_by_subtype.items():
+            i = self._gc_subtype_index(gc_subtype)
+            self._counts[i] += len(times)
+            self._stws[i] = sum(times, self._stws[i])
+
+    def _reset_gc_type_stats(self):
+        """
+        清空GC类型细分统计
+
+        细分统计按列存放：子类型名 -> 下标，次数和暂停时间分别存放在两个定长数组中，
+        每个GC事件只需一次字典查找和两次数组累加，get_result时才构建嵌套字典
+        """
+        self._subtype_id = {}
+        self._counts = array('Q')
+        self._stws = array('d')
+
+    def _gc_subtype_index(self, gc_subtype: str) -> int:
+        """返回GC子类型在细分统计数组中的下标，首次出现时追加新的一项"""
+        i = self._subtype_id.get(gc_subtype)
+        if i is None:
+            i = len(self._subtype_id)
+            self._subtype_id[gc_subtype] = i
+            self._counts.append(0)
+            self._stws.append(0.0)
+        return i
+
+    def add_gc_type_stats(self, gc_subtype: str, count: int, stw_time: float):
+        """向GC类型细分统计中累加某个子类型的次数和暂停时间"""
+        i = self._gc_subtype_index(gc_subtype)
+        self._counts[i] += count
+        self._stws[i] += stw_time
+
+    @property
+    def gc_type_breakdown(self) -> Dict[str, Dict[str, Any]]:
+        """GC类型细分统计：{子类型: {"count": 次数, "stw_time_ms": 暂停时间}}"""
+        counts, stws = self._counts, self._stws
+        return {
+            gc_subtype: {"count": counts[i], "stw_time_ms": stws[i]}
+            for gc_subtype, i in self._subtype_id.items()
+        }
+
     def record_gc_id(self, line: str):
         """记录日志范围内出现过的唯一GC ID。"""
-        for match in re.finditer(r'GC\((\d+)\)', line):
+        for match in _GC_ID_TEXT_PATTERN.finditer(line):
             self.gc_ids.add(int(match.group(1)))
+
+    def record_gc_ids(self, buffer: bytes):
+        """一次性记录整个日志缓冲区（bytes或mmap）中出现过的唯一GC ID。"""
+        self.gc_ids.update(int(gc_id) for gc_id in GC_ID_PATTERN.findall(buffer))
     
     def get_result(self) -> Dict[str, Any]:
         """返回解析结果"""
@@ -141,5 +264,86 @@ class BaseGCParser(ABC):
         self.total_stw_time = 0.0
         self.max_stw_time = 0.0
         self.max_heap_usage = 0
-        self.gc_type_breakdown = {}
         self.gc_ids = set()
+        self._reset_gc_type_stats()
+
+
+class _PauseCycleMixin:
+    """
+    按GC周期汇总暂停事件的公共实现（Shenandoah、ZGC）
+
+    解析时只记录每次暂停的GC周期ID、暂停类型和时间，get_result时再把同一周期的暂停合并统计为一次GC。
+    需放在BaseGCParser之前继承，子类只负责识别暂停事件并确定暂停类型
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._reset_pause_records()
+
+    def _reset_pause_records(self):
+        # 所有暂停事件按出现顺序存放在三个平行序列中：GC周期ID、暂停类型、暂停时间（定长的double数组）
+        self._pause_gc_ids = []
+        self._pause_types = []
+        self._pause_times = array('d')
+        self._finalized_pause_count = None  # 上次汇总统计时的暂停事件数
+
+    def _record_pause(self, gc_id: str, gc_subtype: str, pause_time: float):
+        """记录一次暂停事件，只追加到平行序列，不做任何字典查找"""
+        # 同一周期的多次暂停共用一个GC ID字符串对象，分组时其哈希值只需计算一次
+        self._pause_gc_ids.append(sys.intern(gc_id))
+        self._pause_types.append(gc_subtype)
+        self._pause_times.append(pause_time)
+
+    def _finalize_gc_stats(self):
+        """最终化GC统计信息，将每个GC周期的总时间统计为一次GC"""
+        
+        # 上次汇总之后没有新的暂停事件时，已有的统计结果仍然有效，无需重新计算
+        if self._finalized_pause_count == len(self._pause_times):
+            return
+        self._finalized_pause_count = len(self._pause_times)
+        
+        # 重置基类的统计数据，因为我们准备重新计算
+        self.gc_count = 0
+        self.total_stw_time = 0.0
+        self.max_stw_time = 0.0
+        self._reset_gc_type_stats()
+        
+        # 一次遍历所有暂停事件，按GC周期分组：周期总时间，以及周期内每种暂停类型的时间
+        # （defaultdict保持周期和暂停类型首次出现的顺序，累加顺序与事件顺序一致）
+        cycle_times = defaultdict(float)
+        cycle_pauses = defaultdict(lambda: defaultdict(float))
+        for gc_id, pause_type, pause_time in zip(self._pause_gc_ids, self._pause_types, self._pause_times):
+            cycle_times[gc_id] += pause_time
+            cycle_pauses[gc_id][pause_type] += pause_time
+        
+        # 每个GC周期统计为一次GC
+        self.gc_count = len(cycle_times)
+        self.total_stw_time = sum(cycle_times.values(), 0.0)
+        
+        # 每种暂停类型的次数为出现过它的GC周期数，单次暂停时间为它在一个周期内的总时间
+        all_single_pauses = []
+        for pause_times in cycle_pauses.values():
+            for pause_type, pause_time in pause_times.items():
+                self.add_gc_type_stats(pause_type, 1, pause_time)
+                all_single_pauses.append(pause_time)
+        
+        # 计算最大单次暂停时间（这是正确的max_stw_time定义）
+        self.max_stw_time = max(all_single_pauses, default=0.0)
+
+    def get_result(self):
+        """返回解析结果，包含最大堆容量信息"""
+        
+        # 在返回结果之前，先统计所有GC周期的信息
+        self._finalize_gc_stats()
+        
+        result = super().get_result()
+        
+        result["max_heap_mb"] = self.max_heap_usage
+            
+        return result
+
+    def reset(self):
+        """重置解析器状态"""
+        super().reset()
+        # 清空暂停事件记录
+        self._reset_pause_records()
@@ -6,6 +6,33 @@ import re
 from .base_parser import BaseGCParser
 
 
+# 关键字预过滤：在转为小写的缓冲区上一次扫描找到可能相关的日志行，不含任何关键字的行直接跳过
+# （全部使用小写的字面量，避免忽略大小写匹配带来的逐字节回退）
+_TRIGGER_PATTERN = re.compile(rb'used|heap:|heap address:|max capacity:|resizeable heap;|pause|stop|safepoint')
+_SUMMARY_COMMITTED_PATTERN = re.compile(rb'(\d+)M\s*\([^)]+\)\s+committed')
+_SUMMARY_USED_PATTERN = re.compile(rb'(\d+)M\s*\([^)]+\)\s+used')
+_SUMMARY_RESERVED_PATTERN = re.compile(rb'(\d+)M\s+reserved')
+_PAUSE_PATTERN = re.compile(rb'(pause|stop|safepoint).*?(\d+(?:\.\d+)?)ms')
+_HEAP_USED_PATTERN = re.compile(rb'Heap\s+used\s+(\d+)M')
+_HEAP_EXIT_PATTERN = re.compile(rb'total\s+(\d+)K,\s+used\s+(\d+)K')
+
+
+def _int_after(line: bytes, keyword: bytes, unit: bytes) -> int:
+    """
+    提取"关键字 数字 单位"形式中的整数，如 _int_after(b"max: 4096M", b"max:", b"M") -> 4096
+
+    关键字与数字、数字与单位之间允许有空白；找不到时返回-1。固定前缀的单个整数无需经过正则引擎
+    """
+    start = line.find(keyword)
+    while start >= 0:
+        rest = line[start + len(keyword):].lstrip()
+        value = rest[:len(rest) - len(rest.lstrip(b'0123456789'))]
+        if value and rest[len(value):].lstrip().startswith(unit):
+            return int(value)
+        start = line.find(keyword, start + 1)
+    return -1
+
+
 class EpsilonGCParser(BaseGCParser):
     """Epsilon GC日志解析器"""
     
@@ -19,97 +46,123 @@ class EpsilonGCParser(BaseGCParser):
     
     def parse_log_line(self, line: str) -> bool:
         """解析Epsilon GC日志行"""
-        line = line.strip()
-        
+        return self._parse(line.encode('utf-8'))
+
+    def parse_buffer(self, buffer: bytes):
+        """用关键字预过滤整体扫描日志缓冲区，不再逐行解码和匹配"""
+        self._parse(buffer)
+
+    def _parse(self, buffer: bytes) -> bool:
+        """
+        用关键字预过滤找到缓冲区中可能相关的日志行，逐行交给_parse_line处理
+
+        Returns:
+            bool: 是否解析到暂停事件
+        """
+        found_pause = False
+        # bytes.lower只转换ASCII字母，各行在两个缓冲区中的位置完全一致
+        lowered = bytes(buffer).lower()
+        pos = 0
+        while True:
+            match = _TRIGGER_PATTERN.search(lowered, pos)
+            if match is None:
+                break
+            # 取出关键字所在的整行，处理后从下一行继续扫描
+            start = lowered.rfind(b"\n", 0, match.start()) + 1
+            end = lowered.find(b"\n", match.end())
+            if end < 0:
+                end = len(lowered)
+            if self._parse_line(buffer[start:end]):
+                found_pause = True
+            pos = end + 1
+        return found_pause
+
+    def _parse_line(self, line: bytes) -> bool:
+        """按各类日志行的判断优先级，把一行分派给对应的处理方法"""
+        if b"Resizeable heap;" in line:
+            return self._handle_resizeable(line)
+        if b"Heap address:" in line and b"size:" in line:
+            return self._handle_heap_address(line)
+        if b"Heap:" in line and b"reserved," in line and b"committed," in line and b"used" in line:
+            return self._handle_heap_summary(line)
+        if b"Max Capacity:" in line:
+            return self._handle_max_capacity(line)
+        return self._handle_other(line)
+
+    def _handle_resizeable(self, line: bytes) -> bool:
         # 解析堆大小信息 - EpsilonGC特有的格式
         # 格式: Resizeable heap; starting at 256M, max: 4096M
-        if "Resizeable heap;" in line:
-            start_match = re.search(r'starting at (\d+)M', line)
-            max_match = re.search(r'max: (\d+)M', line)
-            if max_match:
-                self.max_heap_capacity = int(max_match.group(1))
-            return False
-        
+        max_mb = _int_after(line, b"max:", b"M")
+        if max_mb >= 0:
+            self.max_heap_capacity = max_mb
+        return False
+
+    def _handle_heap_address(self, line: bytes) -> bool:
         # 解析堆地址信息 - 格式: size: 4096 MB
-        if "Heap address:" in line and "size:" in line:
-            size_match = re.search(r'size:\s*(\d+)\s*MB', line)
-            if size_match:
-                self.max_heap_capacity = int(size_match.group(1))
-            return False
-        
+        size_mb = _int_after(line, b"size:", b"MB")
+        if size_mb >= 0:
+            self.max_heap_capacity = size_mb
+        return False
+
+    def _handle_heap_summary(self, line: bytes) -> bool:
         # 解析堆使用信息 - 格式: Heap: 4096M reserved, 256M (6.25%) committed, 1809K (0.04%) used
-        if "Heap:" in line and "reserved," in line and "committed," in line and "used" in line:
-            committed_match = re.search(r'(\d+)M\s*\([^)]+\)\s+committed', line)
-            if committed_match:
-                committed_mb = int(committed_match.group(1))
-                self.committed_heap_size = committed_mb  # 保存committed大小
-                self.max_heap_capacity = max(self.max_heap_capacity, committed_mb)
-            used_match = re.search(r'(\d+)M\s*\([^)]+\)\s+used', line)
-            if used_match:
-                used_mb = int(used_match.group(1))
-                self.max_heap_usage = max(self.max_heap_usage, used_mb)
-            
-            # 提取reserved大小（最大堆容量）
-            reserved_match = re.search(r'(\d+)M\s+reserved', line)
-            if reserved_match:
-                reserved_mb = int(reserved_match.group(1))
-                self.max_heap_capacity = max(self.max_heap_capacity, reserved_mb)
-            return False
-            
-        # 解析最大堆容量 - 从初始化日志中提取
-        if "Max Capacity:" in line:
-            match = re.search(r'Max Capacity:\s*(\d+)M', line)
-            if match:
-                self.max_heap_capacity = int(match.group(1))
-            return False
-            
-        # 解析堆大小信息 - 格式: Heap Max Capacity: 4G
-        heap_capacity_pattern = r'Heap Max Capacity:\s*(\d+)G'
-        heap_g_match = re.search(heap_capacity_pattern, line)
-        if heap_g_match:
-            self.max_heap_capacity = int(heap_g_match.group(1)) * 1024
-            return False
-            
-        heap_mb_pattern = r'Heap Max Capacity:\s*(\d+)M'
-        heap_mb_match = re.search(heap_mb_pattern, line)
-        if heap_mb_match:
-            self.max_heap_capacity = int(heap_mb_match.group(1))
-            return False
-            
+        committed_match = _SUMMARY_COMMITTED_PATTERN.search(line)
+        if committed_match:
+            committed_mb = int(committed_match.group(1))
+            self.committed_heap_size = committed_mb  # 保存committed大小
+            self.max_heap_capacity = max(self.max_heap_capacity, committed_mb)
+        used_match = _SUMMARY_USED_PATTERN.search(line)
+        if used_match:
+            used_mb = int(used_match.group(1))
+            self.max_heap_usage = max(self.max_heap_usage, used_mb)
+
+        # 提取reserved大小（最大堆容量）
+        reserved_match = _SUMMARY_RESERVED_PATTERN.search(line)
+        if reserved_match:
+            reserved_mb = int(reserved_match.group(1))
+            self.max_heap_capacity = max(self.max_heap_capacity, reserved_mb)
+        return False
+
+    def _handle_max_capacity(self, line: bytes) -> bool:
+        # 解析最大堆容量 - 从初始化日志中提取（"Heap Max Capacity:" 行也由此处理）
+        max_capacity_mb = _int_after(line, b"Max Capacity:", b"M")
+        if max_capacity_mb >= 0:
+            self.max_heap_capacity = max_capacity_mb
+        return False
+
+    def _handle_other(self, line: bytes) -> bool:
         # Epsilon GC不会执行GC，但可能有其他暂停事件
         # 解析暂停事件（非GC相关的）
-        pause_pattern = r'(pause|stop|safepoint).*?(\d+(?:\.\d+)?)ms'
-        pause_match = re.search(pause_pattern, line.lower())
-        
+        pause_match = _PAUSE_PATTERN.search(line.lower())
+
         if pause_match:
-            pause_type = pause_match.group(1)
+            pause_type = pause_match.group(1).decode('utf-8')
             stw_time = float(pause_match.group(2))
-            
+
             # Epsilon GC中的暂停通常不是GC相关的，但我们需要记录为非GC暂停
             # 只有当暂停时间大于某个阈值时才计数
             if stw_time > 0.1:  # 大于0.1ms的暂停才记录
                 gc_subtype = f"Non-GC Pause ({pause_type})"
                 self.update_gc_stats(gc_subtype, stw_time)
                 return True
-                
+
         # 解析堆使用信息
-        if "Heap" in line and "used" in line:
+        if b"Heap" in line and b"used" in line:
             # 格式: Heap used 28M, capacity 256M, max capacity 4096M
-            heap_match = re.search(r'Heap\s+used\s+(\d+)M', line)
+            heap_match = _HEAP_USED_PATTERN.search(line)
             if heap_match:
                 used = int(heap_match.group(1))
                 self.max_heap_usage = max(self.max_heap_usage, used)
             return False
-            
+
         # 解析Exit时的堆信息
-        if "total" in line and "used" in line and "K" in line:
-            heap_exit_pattern = r'total\s+(\d+)K,\s+used\s+(\d+)K'
-            heap_exit_match = re.search(heap_exit_pattern, line)
+        if b"total" in line and b"used" in line and b"K" in line:
+            heap_exit_match = _HEAP_EXIT_PATTERN.search(line)
             if heap_exit_match:
-                used = int(heap_exit_match.group(2)) // 1024
+                used = int(heap_exit_match.group(2)) >> 10
                 self.max_heap_usage = max(self.max_heap_usage, used)
             return False
-            
+
         return False
     
     def get_result(self):
@@ -127,3 +180,4 @@ class EpsilonGCParser(BaseGCParser):
         result["max_heap_mb"] = self.max_heap_usage
             
         return result
+
@@ -6,17 +6,34 @@ GC日志分析器使用示例
 import os
 import sys
 import json
+import re
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # 添加src目录到Python路径
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from GCLogAnalyzer import GCLogAnalyzer
+from GCLogAnalyzer import parse_gc_log_file
+
+# 文件名中的GC类型关键字 -> 展示用的GC类型名称
+_GC_TYPE_NAMES = {
+    'serialgc': 'SerialGC',
+    'parallelgc': 'ParallelGC',
+    'g1gc': 'G1GC',
+    'zgc': 'ZGC',
+    'shenandoahgc': 'ShenandoahGC',
+    'epsilongc': 'EpsilonGC',
+}
+_GC_TYPE_PATTERN = re.compile('|'.join(_GC_TYPE_NAMES))
 
 
 def analyze_gc_logs():
     """分析所有GC日志文件"""
-    analyzer = GCLogAnalyzer()
     gc_logs_dir = Path(__file__).parent.parent.parent / "gclogs"
     
     print("Java GC日志分析示例")
@@ -33,15 +50,21 @@ def analyze_gc_logs():
     
     results = {}
     
+    # 各文件的解析互不依赖且受CPU限制，用进程池并行解析，只向子进程传递文件路径
+    existing_files = [filename for filename in demo_files if (gc_logs_dir / filename).exists()]
+    with ProcessPoolExecutor(max_workers=max(1, min(len(existing_files), os.cpu_count() or 1))) as executor:
+        futures = {
+            filename: executor.submit(parse_gc_log_file, str(gc_logs_dir / filename))
+            for filename in existing_files
+        }
+    
     for filename in demo_files:
-        gc_log_file = gc_logs_dir / filename
-        
-        if gc_log_file.exists():
+        if filename in futures:
             print(f"\n分析文件: {filename}")
             print("-" * 40)
             
             try:
-                result = analyzer.parse_gc_log(str(gc_log_file))
+                result = futures[filename].result()
                 results[filename] = result
                 
                 # 打印摘要信息
@@ -77,8 +100,13 @@ def analyze_gc_logs():
     
     # 保存详细结果到JSON文件
     output_file = Path(__file__).parent / "gc_analysis_results.json"
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(results, f, indent=2, ensure_ascii=False)
+    # 安装了orjson时优先使用orjson直接序列化为字节
+    if orjson is not None:
+        with open(output_file, 'wb') as f:
+            f.write(orjson.dumps(results, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+    else:
+        with open(output_file, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
     
     print(f"\n详细分析结果已保存到: {output_file}")
 
@@ -95,20 +123,8 @@ def show_gc_type_distribution():
     for gc_log_file in gc_logs_dir.glob("*.log"):
         filename = gc_log_file.name.lower()
         
-        if 'serialgc' in filename:
-            gc_type = 'SerialGC'
-        elif 'parallelgc' in filename:
-            gc_type = 'ParallelGC'
-        elif 'g1gc' in filename:
-            gc_type = 'G1GC'
-        elif 'zgc' in filename:
-            gc_type = 'ZGC'
-        elif 'shenandoahgc' in filename:
-            gc_type = 'ShenandoahGC'
-        elif 'epsilongc' in filename:
-            gc_type = 'EpsilonGC'
-        else:
-            gc_type = 'Unknown'
+        match = _GC_TYPE_PATTERN.search(filename)
+        gc_type = _GC_TYPE_NAMES[match.group()] if match else 'Unknown'
         
         gc_type_counts[gc_type] = gc_type_counts.get(gc_type, 0) + 1
     
@@ -3,9 +3,24 @@ Parallel GC日志解析器
 解析Parallel GC和ParallelOld GC的日志格式
 """
 import re
+import sys
 from .base_parser import BaseGCParser
 
 
+_MAX_CAPACITY_G_PATTERN = re.compile(r'Heap Max Capacity:\s*(\d+)G')
+_MAX_CAPACITY_M_PATTERN = re.compile(r'Heap Max Capacity:\s*(\d+)M')
+# GC事件，如 GC(0) Pause Young (Allocation Failure) 64M->0M(245M) 0.736ms
+# （暂停类型的写法等价于(.+?)，只是其后的\s+不会从空白中间反复尝试）
+_GC_PATTERN = re.compile(r'GC\((\d+)\)\s+Pause\s+([^\S\n]|.*?\S)\s+(\d+)M->(\d+)M\((\d+)M\)\s+([\d.]+)ms')
+# PSYoungGen: 65536K(76288K)->688K(76288K)
+_YOUNG_GEN_PATTERN = re.compile(r'PSYoungGen:\s+(\d+)K(?:\(\d+K\))?->(\d+)K\((\d+)K\)')
+# ParOldGen: 0K(175104K)->8K(175104K)
+_OLD_GEN_PATTERN = re.compile(r'ParOldGen:\s+(\d+)K(?:\(\d+K\))?->(\d+)K\((\d+)K\)')
+_HEAP_EXIT_PATTERN = re.compile(r'total\s+(\d+)K,\s+used\s+(\d+)K')
+# (暂停类型中的子类型关键字, 子类型名称)，按判断优先级排列：取第一个出现在暂停类型中的关键字
+_SUBTYPES = (('Young', "Young GC"), ('Full', "Full GC"), ('Old', "Old GC"), ('Major', "Old GC"))
+
+
 class ParallelGCParser(BaseGCParser):
     """Parallel GC日志解析器"""
     
@@ -18,15 +33,17 @@ class ParallelGCParser(BaseGCParser):
     
     def parse_log_line(self, line: str) -> bool:
         """解析Parallel GC日志行"""
-        line = line.strip()
+        # 快速排除：下面每个分支都要求行中含有这些关键字之一，都不含的行无需正则匹配
+        if not ("Pause" in line or "PSYoungGen:" in line or "ParOldGen:" in line or "total" in line or "Heap Max Capacity:" in line):
+            return False
         
         # 解析最大堆容量
         if "Heap Max Capacity:" in line:
-            match = re.search(r'Heap Max Capacity:\s*(\d+)G', line)
+            match = _MAX_CAPACITY_G_PATTERN.search(line)
             if match:
                 self.max_heap_capacity = int(match.group(1)) * 1024
             else:
-                match = re.search(r'Heap Max Capacity:\s*(\d+)M', line)
+                match = _MAX_CAPACITY_M_PATTERN.search(line)
                 if match:
                     self.max_heap_capacity = int(match.group(1))
             return False
@@ -34,8 +51,7 @@ class ParallelGCParser(BaseGCParser):
         # 解析GC事件 - Parallel GC格式
         # 格式: GC(0) Pause Young (Allocation Failure) 64M->0M(245M) 0.736ms
         # 注意：必须包含Pause关键字，避免匹配到Phase等子阶段
-        gc_pattern = r'GC\((\d+)\)\s+Pause\s+(.+?)\s+(\d+)M->(\d+)M\((\d+)M\)\s+([\d.]+)ms'
-        gc_match = re.search(gc_pattern, line)
+        gc_match = _GC_PATTERN.search(line) if "Pause" in line else None
         
         if gc_match:
             gc_id = gc_match.group(1)
@@ -45,45 +61,39 @@ class ParallelGCParser(BaseGCParser):
             stw_time = float(gc_match.group(6))
             
             # 确定GC子类型
-            if "Young" in gc_type:
-                gc_subtype = "Young GC"
-            elif "Full" in gc_type:
-                gc_subtype = "Full GC"
-            elif "Old" in gc_type or "Major" in gc_type:
-                gc_subtype = "Old GC"
+            for keyword, gc_subtype in _SUBTYPES:
+                if keyword in gc_type:
+                    break
             else:
-                gc_subtype = gc_type.strip()
+                gc_subtype = sys.intern(gc_type.strip())
             
             self.update_gc_stats(gc_subtype, stw_time, heap_before, heap_after)
             return True
             
         # 解析堆使用信息 - Parallel GC特有的格式
         # PSYoungGen: 65536K(76288K)->688K(76288K)
-        young_gen_pattern = r'PSYoungGen:\s+(\d+)K(?:\(\d+K\))?->(\d+)K\((\d+)K\)'
-        young_match = re.search(young_gen_pattern, line)
+        young_match = _YOUNG_GEN_PATTERN.search(line) if "PSYoungGen:" in line else None
         
         if young_match:
-            used_before = int(young_match.group(1)) // 1024
-            used_after = int(young_match.group(2)) // 1024
+            used_before = int(young_match.group(1)) >> 10
+            used_after = int(young_match.group(2)) >> 10
             self.max_heap_usage = max(self.max_heap_usage, used_before, used_after)
             return False
             
         # ParOldGen: 0K(175104K)->8K(175104K)
-        old_gen_pattern = r'ParOldGen:\s+(\d+)K(?:\(\d+K\))?->(\d+)K\((\d+)K\)'
-        old_match = re.search(old_gen_pattern, line)
+        old_match = _OLD_GEN_PATTERN.search(line) if "ParOldGen:" in line else None
         
         if old_match:
-            used_before = int(old_match.group(1)) // 1024
-            used_after = int(old_match.group(2)) // 1024
+            used_before = int(old_match.group(1)) >> 10
+            used_after = int(old_match.group(2)) >> 10
             self.max_heap_usage = max(self.max_heap_usage, used_before, used_after)
             return False
             
         # 解析exit时的堆信息
         if "total" in line and "used" in line and "K" in line:
-            heap_exit_pattern = r'total\s+(\d+)K,\s+used\s+(\d+)K'
-            heap_exit_match = re.search(heap_exit_pattern, line)
+            heap_exit_match = _HEAP_EXIT_PATTERN.search(line)
             if heap_exit_match:
-                used = int(heap_exit_match.group(2)) // 1024
+                used = int(heap_exit_match.group(2)) >> 10
                 self.max_heap_usage = max(self.max_heap_usage, used)
                 return False
                 
@@ -3,9 +3,22 @@ Serial GC日志解析器
 解析Serial GC的日志格式
 """
 import re
+import sys
 from .base_parser import BaseGCParser
 
 
+_MAX_CAPACITY_G_PATTERN = re.compile(r'Heap Max Capacity:\s*(\d+)G')
+_MAX_CAPACITY_M_PATTERN = re.compile(r'Heap Max Capacity:\s*(\d+)M')
+_PAUSE_START_PATTERN = re.compile(r'GC\((\d+)\)\s+Pause\s+')
+# GC事件，如 GC(0) Pause Young (Allocation Failure) 69M->1M(247M) 0.498ms
+# （暂停类型的写法等价于(.+?)，只是其后的\s+不会从空白中间反复尝试）
+_GC_PATTERN = re.compile(r'GC\((\d+)\)\s+Pause\s+([^\S\n]|.*?\S)\s+(\d+)M->(\d+)M\((\d+)M\)\s+([\d.]+)ms')
+# 各分代空间的堆使用信息
+_HEAP_PATTERN = re.compile(r'(DefNew|Tenured| eden space| from space| to space| object space)\s+.*?(\d+)K,\s*(\d+)%\s*used')
+# (暂停类型中的子类型关键字, 子类型名称)，按判断优先级排列：取第一个出现在暂停类型中的关键字
+_SUBTYPES = (('Young', "Young GC"), ('Full', "Full GC"))
+
+
 class SerialGCParser(BaseGCParser):
     """Serial GC日志解析器"""
     
@@ -19,28 +32,31 @@ class SerialGCParser(BaseGCParser):
     
     def parse_log_line(self, line: str) -> bool:
         """解析Serial GC日志行"""
-        line = line.strip()
+        # 快速排除：下面每个分支都要求行中含有这些关键字之一，都不含的行无需正则匹配
+        if not ("Pause" in line or "used" in line or "Heap Max Capacity:" in line):
+            return False
         
         # 解析最大堆容量
         if "Heap Max Capacity:" in line:
-            match = re.search(r'Heap Max Capacity:\s*(\d+)G', line)
+            match = _MAX_CAPACITY_G_PATTERN.search(line)
             if match:
                 self.max_heap_capacity = int(match.group(1)) * 1024
             else:
-                match = re.search(r'Heap Max Capacity:\s*(\d+)M', line)
+                match = _MAX_CAPACITY_M_PATTERN.search(line)
                 if match:
                     self.max_heap_capacity = int(match.group(1))
             return False
         
-        start_match = re.search(r'GC\((\d+)\)\s+Pause\s+', line)
+        # 各正则都含有固定的关键字，先用子串判断过滤，不含关键字的行不进入正则引擎
+        start_match = _PAUSE_START_PATTERN.search(line) if "Pause" in line else None
         if "[gc,start" in line and start_match:
             self.active_pause_ids.append(start_match.group(1))
             return False
             
         # 解析GC事件 - 格式类似: GC(0) Pause Young (Allocation Failure) 69M->1M(247M) 0.498ms
         # 注意：必须包含Pause关键字，避免匹配到Phase等子阶段
-        gc_pattern = r'GC\((\d+)\)\s+Pause\s+(.+?)\s+(\d+)M->(\d+)M\((\d+)M\)\s+([\d.]+)ms'
-        gc_match = re.search(gc_pattern, line)
+        # 汇总行与暂停开始行的前缀相同：前缀不存在时无需再匹配，存在时从前缀所在位置开始匹配
+        gc_match = _GC_PATTERN.search(line, start_match.start()) if start_match else None
         
         if gc_match:
             gc_id = gc_match.group(1)
@@ -50,12 +66,11 @@ class SerialGCParser(BaseGCParser):
             stw_time = float(gc_match.group(6))
             
             # 确定GC子类型
-            if "Young" in gc_type:
-                gc_subtype = "Young GC"
-            elif "Full" in gc_type:
-                gc_subtype = "Full GC"  
+            for keyword, gc_subtype in _SUBTYPES:
+                if keyword in gc_type:
+                    break
             else:
-                gc_subtype = gc_type.strip()
+                gc_subtype = sys.intern(gc_type.strip())
             
             is_outer_pause = not self.active_pause_ids or self.active_pause_ids[0] == gc_id
             if is_outer_pause:
@@ -67,15 +82,14 @@ class SerialGCParser(BaseGCParser):
             return True
             
         # 解析堆使用信息
-        heap_pattern = r'(DefNew|Tenured| eden space| from space| to space| object space)\s+.*?(\d+)K,\s*(\d+)%\s*used'
-        heap_match = re.search(heap_pattern, line)
+        heap_match = _HEAP_PATTERN.search(line) if "used" in line else None
         
         if heap_match:
             space_type = heap_match.group(1)
             total_kb = int(heap_match.group(2))
             used_percent = int(heap_match.group(3))
             used_kb = total_kb * used_percent // 100
-            usage_mb = used_kb // 1024
+            usage_mb = used_kb >> 10
             self.max_heap_usage = max(self.max_heap_usage, usage_mb)
             return False
             
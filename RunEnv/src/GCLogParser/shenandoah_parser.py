@@ -3,34 +3,65 @@ Shenandoah GC日志解析器
 解析Shenandoah GC的日志格式
 """
 import re
-from .base_parser import BaseGCParser
+import sys
+from .base_parser import BaseGCParser, _PauseCycleMixin
 
 
-class ShenandoahGCParser(BaseGCParser):
+_MAX_CAPACITY_PATTERN = re.compile(r'Max Capacity:\s*(\d+)M')
+# 堆变化信息，如 3722M->3722M(4096M)
+_HEAP_TRANSITION_PATTERN = re.compile(r'(\d+)M->(\d+)M\((\d+)M\)')
+# 堆变化信息及其后的内容，用于从暂停类型中移除
+_HEAP_SUFFIX_PATTERN = re.compile(r'\s*\d+M->\d+M\(\d+M\).*$')
+# STW暂停事件，如 GC(0) Pause Init Mark (unload classes) 0.123ms
+# 暂停类型只允许以非空白字符结尾（或本身是一个空白字符），结果与(.+?)相同，但不会在长串空白上反复回溯
+_STW_PATTERN = re.compile(r'GC\((\d+)\)\s+Pause\s+([^\S\n]|.*?\S)\s+([\d.]+)ms\s*$')
+# (暂停类型中的子类型关键字, 子类型名称)，按判断优先级排列：取第一个出现在暂停类型中的关键字
+# （Degenerated GC的名称需要从暂停类型中提取，优先单独判断）
+_SUBTYPES = (
+    ('Full', "Full GC"),
+    ('Init Mark', "Init Mark (unload classes)"),
+    ('Final Mark', "Final Mark (unload classes)"),
+    ('Final Roots', "Final Roots"),
+    ('Init Update Refs', "Init Update Refs"),
+    ('Final Update Refs', "Final Update Refs"),
+    ('Concurrent', "Concurrent GC"),
+)
+_DEGENERATED_PATTERN = re.compile(r'Degenerated GC\s*\((.*?)\)')
+_HEAP_INFO_PATTERN = re.compile(r'(\d+)M\s+max,\s+(\d+)M\s+soft\s+max,\s+(\d+)M\s+committed,\s+(\d+)M\s+used')
+_FREE_USED_PATTERN = re.compile(r'Used:\s*(\d+)(B|K|M|G)')
+_GENERATION_USED_PATTERN = re.compile(r'generation used:\s*(\d+)(B|K|M|G)')
+_HEAP_EXIT_PATTERN = re.compile(r'(\d+)M\s+used,\s+(\d+)M\s+committed')
+
+
+class ShenandoahGCParser(_PauseCycleMixin, BaseGCParser):
     """Shenandoah GC日志解析器"""
     
+    # 与parse_log_line开头的快速排除条件一致，整体解析时只有含这些关键字的行才会被解码和解析
+    _LINE_TRIGGER_PATTERN = re.compile(rb'Pause|M->|used|Used:|Max Capacity:')
+    
     def __init__(self):
         super().__init__()
         self.max_heap_capacity = 0
-        self.gc_cycles = {}  # 记录每个GC周期的所有暂停事件
         
     def get_gc_type(self) -> str:
         return "ShenandoahGC"
     
     def parse_log_line(self, line: str) -> bool:
         """解析Shenandoah GC日志行"""
-        line = line.strip()
+        # 快速排除：下面每个分支都要求行中含有这些关键字之一，都不含的行无需正则匹配
+        if not ("Pause" in line or "M->" in line or "used" in line or "Used:" in line or "Max Capacity:" in line):
+            return False
         
         # 解析最大堆容量 - 从初始化日志中提取
         if "Max Capacity:" in line:
-            match = re.search(r'Max Capacity:\s*(\d+)M', line)
+            match = _MAX_CAPACITY_PATTERN.search(line)
             if match:
                 self.max_heap_capacity = int(match.group(1))
             return False
 
         # Shenandoah 的汇总行可能出现在 concurrent cleanup、degenerated/full 等事件中。
         # before/after 是 heap used，括号内是容量，不计入 max_heap_mb。
-        heap_transition_match = re.search(r'(\d+)M->(\d+)M\((\d+)M\)', line)
+        heap_transition_match = _HEAP_TRANSITION_PATTERN.search(line) if "M->" in line else None
         if heap_transition_match:
             heap_before = int(heap_transition_match.group(1))
             heap_after = int(heap_transition_match.group(2))
@@ -44,8 +75,7 @@ class ShenandoahGCParser(BaseGCParser):
         # 这些是真正的STW事件，而不是concurrent阶段
         
         # 匹配STW暂停事件的模式
-        stw_pattern = r'GC\((\d+)\)\s+Pause\s+(.+?)\s+([\d.]+)ms$'
-        stw_match = re.search(stw_pattern, line)
+        stw_match = _STW_PATTERN.search(line) if "Pause" in line else None
         
         if stw_match:
             gc_id = stw_match.group(1)
@@ -57,51 +87,29 @@ class ShenandoahGCParser(BaseGCParser):
             if "Degenerated GC" in pause_type:
                 gc_subtype = "Degenerated GC"
                 # 尝试提取子类型（如Outside of Cycle）
-                outside_match = re.search(r'Degenerated GC\s*\((.*?)\)', pause_type)
+                outside_match = _DEGENERATED_PATTERN.search(pause_type)
                 if outside_match:
                     subtype = outside_match.group(1).strip()
                     if subtype:
                         gc_subtype = f"Degenerated GC ({subtype})"
                 # 移除堆变化信息（如3722M->3722M(4096M)）
-                heap_info_match = re.search(r'\d+M->\d+M\(\d+M\)', gc_subtype)
+                heap_info_match = _HEAP_TRANSITION_PATTERN.search(gc_subtype)
                 if heap_info_match:
                     # 移除堆信息前的空格和堆信息
-                    gc_subtype = re.sub(r'\s*\d+M->\d+M\(\d+M\).*$', '', gc_subtype).strip()
-            elif "Full" in pause_type:
-                gc_subtype = "Full GC"
-                # 移除堆变化信息
-                gc_subtype = re.sub(r'\s*\d+M->\d+M\(\d+M\).*$', '', gc_subtype).strip()
-            elif "Init Mark" in pause_type:
-                gc_subtype = "Init Mark (unload classes)"
-            elif "Final Mark" in pause_type:
-                gc_subtype = "Final Mark (unload classes)"
-            elif "Final Roots" in pause_type:
-                gc_subtype = "Final Roots"
-            elif "Init Update Refs" in pause_type:
-                gc_subtype = "Init Update Refs"
-            elif "Final Update Refs" in pause_type:
-                gc_subtype = "Final Update Refs"
-            elif "Concurrent" in pause_type:
-                gc_subtype = "Concurrent GC"
+                    gc_subtype = _HEAP_SUFFIX_PATTERN.sub('', gc_subtype).strip()
+                gc_subtype = sys.intern(gc_subtype)  # 驻留拼接出的子类型名称
             else:
-                # 对于其他类型，也移除堆变化信息
-                cleaned_type = re.sub(r'\s*\d+M->\d+M\(\d+M\).*$', '', pause_type).strip()
-                gc_subtype = cleaned_type if cleaned_type else pause_type.strip()
-            
-            # 记录这个GC周期的暂停事件
-            if gc_id not in self.gc_cycles:
-                self.gc_cycles[gc_id] = {
-                    'pause_times': {},  # 分别记录每种暂停类型的时间
-                    'total_time': 0.0
-                }
+                # Full GC的名称本身不含堆变化信息，直接查表
+                for keyword, gc_subtype in _SUBTYPES:
+                    if keyword in pause_type:
+                        break
+                else:
+                    # 对于其他类型，也移除堆变化信息
+                    cleaned_type = _HEAP_SUFFIX_PATTERN.sub('', pause_type).strip()
+                    gc_subtype = sys.intern(cleaned_type if cleaned_type else pause_type.strip())
             
-            # 累加特定暂停类型的时间
-            if gc_subtype not in self.gc_cycles[gc_id]['pause_times']:
-                self.gc_cycles[gc_id]['pause_times'][gc_subtype] = 0.0
-            self.gc_cycles[gc_id]['pause_times'][gc_subtype] += stw_time
-            
-            # 更新这个GC周期的总时间
-            self.gc_cycles[gc_id]['total_time'] += stw_time
+            # 记录这个GC周期的暂停事件，按周期汇总留到_finalize_gc_stats中一次完成
+            self._record_pause(gc_id, gc_subtype, stw_time)
             
             # 对于Shenandoah，我们只在每个GC周期结束时（检测到新的GC ID时）进行统计
             # 这里先返回True表示这行是GC相关，但暂不更新总体统计
@@ -109,7 +117,7 @@ class ShenandoahGCParser(BaseGCParser):
             
         # 解析堆信息 - 获取堆大小
         # 匹配Shenandoah堆信息的完整格式
-        heap_match = re.search(r'(\d+)M\s+max,\s+(\d+)M\s+soft\s+max,\s+(\d+)M\s+committed,\s+(\d+)M\s+used', line)
+        heap_match = _HEAP_INFO_PATTERN.search(line) if "soft" in line else None
         if heap_match:
             max_capacity = int(heap_match.group(1))
             soft_max = int(heap_match.group(2))
@@ -122,86 +130,23 @@ class ShenandoahGCParser(BaseGCParser):
             return False
         
         if "[gc,free" in line and "Used:" in line:
-            for value, unit in re.findall(r'Used:\s*(\d+)(B|K|M|G)', line):
+            for value, unit in _FREE_USED_PATTERN.findall(line):
                 used_mb = self.extract_heap_size(value + unit)
                 self.max_heap_usage = max(self.max_heap_usage, used_mb)
             return False
 
         if "generation used:" in line:
-            for value, unit in re.findall(r'generation used:\s*(\d+)(B|K|M|G)', line):
+            for value, unit in _GENERATION_USED_PATTERN.findall(line):
                 used_mb = self.extract_heap_size(value + unit)
                 self.max_heap_usage = max(self.max_heap_usage, used_mb)
             return False
             
-        # 解析Exit时的堆信息
-        if "Heap" in line and "used" in line and "committed" in line:
-            heap_match = re.search(r'(\d+)M\s+used,\s+(\d+)M\s+committed', line)
+        # 解析Exit时的堆信息（先检查最少见的"committed"，多数行在第一次扫描后即可排除）
+        if "committed" in line and "Heap" in line and "used" in line:
+            heap_match = _HEAP_EXIT_PATTERN.search(line)
             if heap_match:
                 used = int(heap_match.group(1))
                 self.max_heap_usage = max(self.max_heap_usage, used)
             return False
             
         return False
-    
-    def get_result(self):
-        """返回解析结果，包含最大堆容量信息"""
-        
-        # 在返回结果之前，先统计所有GC周期的信息
-        self._finalize_gc_stats()
-        
-        result = super().get_result()
-        
-        result["max_heap_mb"] = self.max_heap_usage
-            
-        return result
-    
-    def _finalize_gc_stats(self):
-        """最终化GC统计信息，将每个GC周期的总时间统计为一次GC"""
-        
-        # 重置基类的统计数据，因为我们准备重新计算
-        self.gc_count = 0
-        self.total_stw_time = 0.0
-        self.max_stw_time = 0.0
-        self.gc_type_breakdown = {}
-        
-        # 收集每种暂停类型的准确时间统计和单次暂停时间
-        type_stats = {}  # 记录每种暂停类型的统计信息
-        all_single_pauses = []  # 记录所有单次暂停时间，用于计算最大值
-        
-        # 遍历每个GC周期
-        for gc_id, cycle_info in self.gc_cycles.items():
-            total_cycle_time = cycle_info['total_time']
-            pause_times = cycle_info['pause_times']
-            
-            # 更新总体统计
-            self.gc_count += 1
-            self.total_stw_time += total_cycle_time
-            self.max_stw_time = max(self.max_stw_time, total_cycle_time)
-            
-            # 统计每种暂停类型的时间和次数
-            for pause_type, pause_time in pause_times.items():
-                if pause_type not in type_stats:
-                    type_stats[pause_type] = {
-                        "count": 0,  # 此类型暂停出现的次数
-                        "total_time": 0.0  # 此类型暂停的总时间
-                    }
-                type_stats[pause_type]["count"] += 1
-                type_stats[pause_type]["total_time"] += pause_time
-                
-                # 记录所有单次暂停时间（用于计算最大单次暂停时间）
-                all_single_pauses.append(pause_time)
-        
-        # 计算最大单次暂停时间（这是正确的max_stw_time定义）
-        self.max_stw_time = max(all_single_pauses) if all_single_pauses else 0.0
-        
-        # 构建最终的gc_type_breakdown
-        for pause_type, stats in type_stats.items():
-            self.gc_type_breakdown[pause_type] = {
-                "count": stats["count"],
-                "stw_time_ms": stats["total_time"]
-            }
-    
-    def reset(self):
-        """重置解析器状态"""
-        super().reset()
-        self.gc_cycles.clear()  # 清空GC周期记录
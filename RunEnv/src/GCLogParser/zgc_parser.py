@@ -3,16 +3,40 @@ ZGC日志解析器
 解析ZGC的日志格式
 """
 import re
-from .base_parser import BaseGCParser
+import sys
+from .base_parser import BaseGCParser, _PauseCycleMixin
 
 
-class ZGCParser(BaseGCParser):
+_MAX_CAPACITY_PATTERN = re.compile(r'Max Capacity:\s*(\d+)M')
+# 分代ZGC的Used行: GC(0) Y: Used: 376M (9%) 378M (9%) 72M (2%) 72M (2%) 378M (9%) 38M (1%)
+_GENERATIONAL_USED_PATTERN = re.compile(r'GC\(\d+\)\s+([yoYO]):\s+Used:\s+(\d+)M\s*\([^)]*\)\s+(\d+)M\s*\([^)]*\)\s+(\d+)M\s*\([^)]*\)\s+(\d+)M\s*\([^)]*\)\s+(\d+)M\s*\([^)]*\)\s+(\d+)M\s*\([^)]*\)')
+# 分代ZGC的简化Used行（没有百分号）: GC(0) Y: Used: 376M 378M 72M 72M 378M 38M
+_SIMPLE_GENERATIONAL_USED_PATTERN = re.compile(r'GC\(\d+\)\s+([yoYO]):\s+Used:\s+(\d+)M\s+(\d+)M\s+(\d+)M\s+(\d+)M\s+(\d+)M\s+(\d+)M')
+# 旧版ZGC的Used行: GC(229) Used: 4086M (100%) 4086M (100%) 108M (3%) 108M (3%) 4086M (100%) 108M (3%)
+_OLD_USED_PATTERN = re.compile(r'GC\(\d+\)\s+Used:\s+(\d+)M\s*\([^)]+\)\s+(\d+)M\s*\([^)]+\)\s+(\d+)M\s*\([^)]+\)\s+(\d+)M\s*\([^)]+\)\s+(\d+)M\s*\([^)]+\)\s+(\d+)M\s*\([^)]+\)')
+# 分代ZGC暂停事件: GC(0) Y: Pause Mark Start (Major) 0.005ms
+# （暂停类型的写法等价于(.+?)，只是其后的\s+不会从空白中间反复尝试）
+_GENERATIONAL_PAUSE_PATTERN = re.compile(r'GC\((\d+)\)\s+([yoYO]):\s+Pause\s+([^\S\n]|.*?\S)\s+([\d.]+)ms\s*$')
+# 旧版ZGC暂停事件: GC(0) Pause Mark Start 0.003ms
+_PAUSE_PATTERN = re.compile(r'GC\((\d+)\)\s+Pause\s+([^\S\n]|.*?\S)\s+([\d.]+)ms\s*$')
+# (暂停类型中的子类型关键字, 子类型名称)，按判断优先级排列：取第一个出现在暂停类型中的关键字
+_SUBTYPES = (
+    ('Mark Start', "Pause Mark Start"),
+    ('Mark End', "Pause Mark End"),
+    ('Relocate Start', "Pause Relocate Start"),
+)
+_ZHEAP_PATTERN = re.compile(r'ZHeap\s+used\s+(\d+)M,\s+capacity\s+(\d+)M,\s+max\s+capacity\s+(\d+)M')
+
+
+class ZGCParser(_PauseCycleMixin, BaseGCParser):
     """ZGC日志解析器"""
     
+    # 与parse_log_line开头的快速排除条件一致，整体解析时只有含这些关键字的行才会被解码和解析
+    _LINE_TRIGGER_PATTERN = re.compile(rb'Pause|Used:|used|Max Capacity:')
+    
     def __init__(self):
         super().__init__()
         self.max_heap_capacity = 0
-        self.gc_cycles = {}  # 记录每个GC周期的所有暂停事件
         self.is_generational_zgc = False  # 是否为分代ZGC (JDK21+)
         
     def get_gc_type(self) -> str:
@@ -25,24 +49,26 @@ class ZGCParser(BaseGCParser):
     
     def parse_log_line(self, line: str) -> bool:
         """解析ZGC日志行"""
-        line = line.strip()
+        # 快速排除：下面每个分支都要求行中含有这些关键字之一，都不含的行无需正则匹配
+        if not ("Pause" in line or "Used:" in line or "used" in line or "Max Capacity:" in line):
+            return False
         
         # 解析最大堆容量 - 从初始化日志中提取
         if "Max Capacity:" in line:
             # 格式: Max Capacity: 4096M
-            match = re.search(r'Max Capacity:\s*(\d+)M', line)
+            match = _MAX_CAPACITY_PATTERN.search(line)
             if match:
                 self.max_heap_capacity = int(match.group(1))
                 # 注意：这里不更新max_heap_usage，因为ZGC的max_heap_usage应该是实际使用量
             return False
             
         # 解析GC结束后的堆使用统计 - 从Used行提取High字段（峰值使用量）
-        if self.is_generational_zgc:
+        # Used行的正则都要求含有"Used:"
+        if "Used:" in line and self.is_generational_zgc:
             # JDK21+分代ZGC格式
             # 整体堆统计: GC(0) Y: Used: 376M 378M 72M 72M 378M 38M
             # 分代堆统计: GC(0) O: Used: 376M 106M 106M 106M 378M 38M
-            generational_used_pattern = r'GC\(\d+\)\s+([yoYO]):\s+Used:\s+(\d+)M\s*\([^)]*\)\s+(\d+)M\s*\([^)]*\)\s+(\d+)M\s*\([^)]*\)\s+(\d+)M\s*\([^)]*\)\s+(\d+)M\s*\([^)]*\)\s+(\d+)M\s*\([^)]*\)'
-            gen_used_match = re.search(generational_used_pattern, line)
+            gen_used_match = _GENERATIONAL_USED_PATTERN.search(line)
             
             if gen_used_match:
                 generation = gen_used_match.group(1)  # Y 或 O
@@ -52,8 +78,7 @@ class ZGCParser(BaseGCParser):
                 return False
             
             # 分代ZGC的简化格式（没有百分号的版本）
-            simple_gen_pattern = r'GC\(\d+\)\s+([yoYO]):\s+Used:\s+(\d+)M\s+(\d+)M\s+(\d+)M\s+(\d+)M\s+(\d+)M\s+(\d+)M'
-            simple_gen_match = re.search(simple_gen_pattern, line)
+            simple_gen_match = _SIMPLE_GENERATIONAL_USED_PATTERN.search(line)
             
             if simple_gen_match:
                 generation = simple_gen_match.group(1)  # Y 或 O
@@ -61,10 +86,9 @@ class ZGCParser(BaseGCParser):
                 high_usage = int(simple_gen_match.group(6))
                 self.max_heap_usage = max(self.max_heap_usage, high_usage)
                 return False
-        else:
+        elif "Used:" in line:
             # 旧版ZGC格式: GC(229)      Used:     4086M (100%)       4086M (100%)        108M (3%)          108M (3%)         4086M (100%)        108M (3%)
-            old_used_pattern = r'GC\(\d+\)\s+Used:\s+(\d+)M\s*\([^)]+\)\s+(\d+)M\s*\([^)]+\)\s+(\d+)M\s*\([^)]+\)\s+(\d+)M\s*\([^)]+\)\s+(\d+)M\s*\([^)]+\)\s+(\d+)M\s*\([^)]+\)'
-            old_used_match = re.search(old_used_pattern, line)
+            old_used_match = _OLD_USED_PATTERN.search(line)
             
             if old_used_match:
                 # 第5个字段是High字段（峰值使用量）
@@ -75,8 +99,7 @@ class ZGCParser(BaseGCParser):
         # 解析ZGC的STW暂停事件
         if self.is_generational_zgc:
             # JDK21+分代ZGC格式: GC(0) Y: Pause Mark Start (Major) 0.005ms
-            generational_pause_pattern = r'GC\((\d+)\)\s+([yoYO]):\s+Pause\s+(.+?)\s+([\d.]+)ms$'
-            gen_pause_match = re.search(generational_pause_pattern, line)
+            gen_pause_match = _GENERATIONAL_PAUSE_PATTERN.search(line) if "Pause" in line else None
             
             if gen_pause_match:
                 gc_id = gen_pause_match.group(1)
@@ -85,35 +108,22 @@ class ZGCParser(BaseGCParser):
                 pause_time = float(gen_pause_match.group(4))
                 
                 # 确定GC子类型 - 基于暂停类型和代
-                if "Mark Start" in pause_type:
-                    gc_subtype = f"Pause Mark Start ({generation} Gen)"
-                elif "Mark End" in pause_type:
-                    gc_subtype = f"Pause Mark End ({generation} Gen)"
-                elif "Relocate Start" in pause_type:
-                    gc_subtype = f"Pause Relocate Start ({generation} Gen)"
+                for keyword, subtype_name in _SUBTYPES:
+                    if keyword in pause_type:
+                        gc_subtype = f"{subtype_name} ({generation} Gen)"
+                        break
                 else:
                     gc_subtype = f"Pause {pause_type.strip()} ({generation} Gen)"
+                # 按代拼接出的子类型名称驻留为同一对象，后续字典查找可直接比较指针
+                gc_subtype = sys.intern(gc_subtype)
                 
-                # 记录这个GC周期的暂停事件
-                if gc_id not in self.gc_cycles:
-                    self.gc_cycles[gc_id] = {
-                        'pause_times': {},  # 分别记录每种暂停类型的时间
-                        'total_time': 0.0
-                    }
-                
-                # 累加特定暂停类型的时间
-                if gc_subtype not in self.gc_cycles[gc_id]['pause_times']:
-                    self.gc_cycles[gc_id]['pause_times'][gc_subtype] = 0.0
-                self.gc_cycles[gc_id]['pause_times'][gc_subtype] += pause_time
-                
-                # 更新这个GC周期的总时间
-                self.gc_cycles[gc_id]['total_time'] += pause_time
+                # 记录这个GC周期的暂停事件，按周期汇总留到_finalize_gc_stats中一次完成
+                self._record_pause(gc_id, gc_subtype, pause_time)
                 
                 return True
         else:
             # 旧版ZGC格式: GC(0) Pause Mark Start 0.003ms
-            zgc_pause_pattern = r'GC\((\d+)\)\s+Pause\s+(.+?)\s+([\d.]+)ms$'
-            pause_match = re.search(zgc_pause_pattern, line)
+            pause_match = _PAUSE_PATTERN.search(line) if "Pause" in line else None
             
             if pause_match:
                 gc_id = pause_match.group(1)
@@ -121,29 +131,14 @@ class ZGCParser(BaseGCParser):
                 pause_time = float(pause_match.group(3))
                 
                 # 确定GC子类型 - 基于暂停类型
-                if "Mark Start" in pause_type:
-                    gc_subtype = "Pause Mark Start"
-                elif "Mark End" in pause_type:
-                    gc_subtype = "Pause Mark End"
-                elif "Relocate Start" in pause_type:
-                    gc_subtype = "Pause Relocate Start"
+                for keyword, gc_subtype in _SUBTYPES:
+                    if keyword in pause_type:
+                        break
                 else:
-                    gc_subtype = pause_type.strip()
-                
-                # 记录这个GC周期的暂停事件
-                if gc_id not in self.gc_cycles:
-                    self.gc_cycles[gc_id] = {
-                        'pause_times': {},  # 分别记录每种暂停类型的时间
-                        'total_time': 0.0
-                    }
-                
-                # 累加特定暂停类型的时间
-                if gc_subtype not in self.gc_cycles[gc_id]['pause_times']:
-                    self.gc_cycles[gc_id]['pause_times'][gc_subtype] = 0.0
-                self.gc_cycles[gc_id]['pause_times'][gc_subtype] += pause_time
+                    gc_subtype = sys.intern(pause_type.strip())
                 
-                # 更新这个GC周期的总时间
-                self.gc_cycles[gc_id]['total_time'] += pause_time
+                # 记录这个GC周期的暂停事件，按周期汇总留到_finalize_gc_stats中一次完成
+                self._record_pause(gc_id, gc_subtype, pause_time)
                 
                 return True
                     
@@ -151,7 +146,7 @@ class ZGCParser(BaseGCParser):
         if "ZHeap" in line and "used" in line:
             # 格式: ZHeap           used 782M, capacity 1596M, max capacity 4096M
             # 注意：ZHeap和used之间可能有多个空格
-            heap_match = re.search(r'ZHeap\s+used\s+(\d+)M,\s+capacity\s+(\d+)M,\s+max\s+capacity\s+(\d+)M', line)
+            heap_match = _ZHEAP_PATTERN.search(line)
             if heap_match:
                 used = int(heap_match.group(1))
                 capacity = int(heap_match.group(2))
@@ -164,66 +159,3 @@ class ZGCParser(BaseGCParser):
             return False
             
         return False
-    
-    def get_result(self):
-        """返回解析结果，包含最大堆容量信息"""
-        
-        # 在返回结果之前，先统计所有GC周期的信息
-        self._finalize_gc_stats()
-        
-        result = super().get_result()
-        
-        result["max_heap_mb"] = self.max_heap_usage
-            
-        return result
-    
-    def _finalize_gc_stats(self):
-        """最终化GC统计信息，将每个GC周期的总时间统计为一次GC"""
-        
-        # 重置基类的统计数据，因为我们准备重新计算
-        self.gc_count = 0
-        self.total_stw_time = 0.0
-        self.max_stw_time = 0.0
-        self.gc_type_breakdown = {}
-        
-        # 收集每种暂停类型的准确时间统计和单次暂停时间
-        type_stats = {}  # 记录每种暂停类型的统计信息
-        all_single_pauses = []  # 记录所有单次暂停时间，用于计算最大值
-        
-        # 遍历每个GC周期
-        for gc_id, cycle_info in self.gc_cycles.items():
-            total_cycle_time = cycle_info['total_time']
-            pause_times = cycle_info['pause_times']
-            
-            # 更新总体统计
-            self.gc_count += 1
-            self.total_stw_time += total_cycle_time
-            self.max_stw_time = max(self.max_stw_time, total_cycle_time)
-            
-            # 统计每种暂停类型的时间和次数
-            for pause_type, pause_time in pause_times.items():
-                if pause_type not in type_stats:
-                    type_stats[pause_type] = {
-                        "count": 0,  # 此类型暂停出现的次数
-                        "total_time": 0.0  # 此类型暂停的总时间
-                    }
-                type_stats[pause_type]["count"] += 1
-                type_stats[pause_type]["total_time"] += pause_time
-                
-                # 记录所有单次暂停时间（用于计算最大单次暂停时间）
-                all_single_pauses.append(pause_time)
-        
-        # 计算最大单次暂停时间（这是正确的max_stw_time定义）
-        self.max_stw_time = max(all_single_pauses) if all_single_pauses else 0.0
-        
-        # 构建最终的gc_type_breakdown
-        for pause_type, stats in type_stats.items():
-            self.gc_type_breakdown[pause_type] = {
-                "count": stats["count"],
-                "stw_time_ms": stats["total_time"]
-            }
-    
-    def reset(self):
-        """重置解析器状态"""
-        super().reset()
-        self.gc_cycles.clear()  # 清空GC周期记录
@@ -10,9 +10,17 @@
 
 import argparse
 import json
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 try:
     from Test_oracles import TEST_ORACLES
 except ImportError:
@@ -21,35 +29,41 @@ except ImportError:
 
 
 class ResAnalyzer:
-    def __init__(self, oracles: Optional[List[Any]] = None):
+    def __init__(self, oracles: Optional[List[Any]] = None, max_workers: Optional[int] = None):
         self.oracles = oracles if oracles is not None else TEST_ORACLES
+        self.max_workers = max_workers if max_workers is not None else (os.cpu_count() or 1)
 
     def analyze_json_file(self, json_file_path: Path) -> List[Dict[str, Any]]:
         file_anomalies = []
+        # 路径字符串和append方法在循环外取一次
+        file_path = str(json_file_path)
+        append = file_anomalies.append
 
         try:
-            with json_file_path.open("r", encoding="utf-8") as f:
-                log_data = json.load(f)
+            content = json_file_path.read_bytes()
+            # 安装了orjson时优先使用orjson解析
+            log_data = orjson.loads(content) if orjson is not None else json.loads(content.decode("utf-8"))
         except Exception as exc:
             return [{
                 "type": "parse_error",
-                "file_path": str(json_file_path),
+                "file_path": file_path,
                 "score": 1.0,
                 "info": [f"测试记录格式异常，JSON解析失败：{exc}"],
             }]
 
         for oracle in self.oracles:
             try:
-                anomaly = oracle(log_data, str(json_file_path))
+                anomaly = oracle(log_data, file_path)
                 if anomaly is not None:
-                    file_anomalies.append(anomaly)
+                    append(anomaly)
             except Exception as exc:
-                file_anomalies.append({
+                oracle_name = oracle.__name__
+                append({
                     "type": "oracle_execution_error",
-                    "file_path": str(json_file_path),
-                    "oracle_name": oracle.__name__,
+                    "file_path": file_path,
+                    "oracle_name": oracle_name,
                     "score": 1.0,
-                    "info": [f"测试预言执行异常，{oracle.__name__}执行失败：{exc}"],
+                    "info": [f"测试预言执行异常，{oracle_name}执行失败：{exc}"],
                 })
 
         return file_anomalies
@@ -59,22 +73,42 @@ class ResAnalyzer:
         output_file = Path(output_path).resolve() if output_path else None
         all_anomalies = []
 
-        for json_file in root.rglob("*.json"):
-            if "reports" in json_file.parts:
-                continue
-            if output_file and json_file.resolve() == output_file:
-                continue
-            all_anomalies.extend(self.analyze_json_file(json_file))
+        json_files = [
+            json_file for json_file in root.rglob("*.json")
+            if "reports" not in json_file.parts
+            and not (output_file and json_file.resolve() == output_file)
+        ]
+
+        if self.max_workers <= 1 or len(json_files) <= 1:
+            for json_file in json_files:
+                all_anomalies.extend(self.analyze_json_file(json_file))
+            return all_anomalies
+
+        # 各文件的解析和预言检查互不依赖，用进程池并行；预言无法传给子进程时（如lambda或闭包）改用线程池。
+        # map按文件顺序返回，结果与顺序执行一致
+        pool_class = ProcessPoolExecutor if self._is_picklable() else ThreadPoolExecutor
+        with pool_class(max_workers=min(self.max_workers, len(json_files))) as executor:
+            for file_anomalies in executor.map(self.analyze_json_file, json_files, chunksize=16):
+                all_anomalies.extend(file_anomalies)
 
         return all_anomalies
 
+    def _is_picklable(self) -> bool:
+        """判断分析器（连同其预言）能否序列化后交给进程池中的子进程"""
+        try:
+            pickle.dumps(self)
+        except Exception:
+            return False
+        return True
+
     def generate_report(self, anomalies: List[Dict[str, Any]]) -> Dict[str, Any]:
         cases = {}
 
         for anomaly in anomalies:
             file_path = anomaly.get("file_path", "unknown")
-            if file_path not in cases:
-                cases[file_path] = {
+            case = cases.get(file_path)
+            if case is None:
+                case = cases[file_path] = {
                     "file_path": file_path,
                     "triggered_oracles": [],
                     "info": [],
@@ -82,11 +116,13 @@ class ResAnalyzer:
                 }
 
             oracle_type = anomaly.get("type", "unknown_oracle")
-            if oracle_type not in cases[file_path]["triggered_oracles"]:
-                cases[file_path]["triggered_oracles"].append(oracle_type)
+            if oracle_type not in case["triggered_oracles"]:
+                case["triggered_oracles"].append(oracle_type)
 
-            cases[file_path]["_score"] += self._extract_score(anomaly)
-            cases[file_path]["info"].extend(self._extract_info(anomaly))
+            # 子异常列表只收集一次，分数和说明共用
+            leaves = self._iter_leaf_anomalies(anomaly)
+            case["_score"] += self._extract_score(anomaly, leaves)
+            case["info"].extend(self._extract_info(anomaly, leaves))
 
         ranked_cases = list(cases.values())
         ranked_cases.sort(key=lambda case: case["_score"], reverse=True)
@@ -96,19 +132,21 @@ class ResAnalyzer:
 
         return {"ranked_cases": ranked_cases}
 
-    def _extract_score(self, anomaly: Dict[str, Any]) -> float:
+    def _extract_score(self, anomaly: Dict[str, Any], leaves: Optional[List[Dict[str, Any]]] = None) -> float:
         if isinstance(anomaly.get("score"), (int, float)):
             return float(anomaly["score"])
 
+        if leaves is None:
+            leaves = self._iter_leaf_anomalies(anomaly)
         total_score = 0.0
-        for item in self._iter_leaf_anomalies(anomaly):
+        for item in leaves:
             score = item.get("score") if isinstance(item, dict) else None
             if isinstance(score, (int, float)):
                 total_score += float(score)
 
         return total_score if total_score > 0 else 1.0
 
-    def _extract_info(self, anomaly: Dict[str, Any]) -> List[str]:
+    def _extract_info(self, anomaly: Dict[str, Any], leaves: Optional[List[Dict[str, Any]]] = None) -> List[str]:
         infos = []
 
         if isinstance(anomaly.get("info"), str):
@@ -116,7 +154,9 @@ class ResAnalyzer:
         elif isinstance(anomaly.get("info"), list):
             infos.extend(item for item in anomaly["info"] if isinstance(item, str))
 
-        for item in self._iter_leaf_anomalies(anomaly):
+        if leaves is None:
+            leaves = self._iter_leaf_anomalies(anomaly)
+        for item in leaves:
             if not isinstance(item, dict):
                 continue
             if isinstance(item.get("info"), str):
@@ -167,6 +207,7 @@ def main() -> None:
     parser = argparse.ArgumentParser(description="综合测试预言极简报告生成器（基础+高级）")
     parser.add_argument("input_dir", help="包含JSON测试记录的目录")
     parser.add_argument("-o", "--output", default="report.json", help="输出报告路径")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="并行分析的进程数（默认: CPU核心数）")
     args = parser.parse_args()
 
     input_path = Path(args.input_dir)
@@ -180,7 +221,7 @@ def main() -> None:
 
     print(f"加载了 {len(TEST_ORACLES)} 个测试预言")
 
-    analyzer = ResAnalyzer()
+    analyzer = ResAnalyzer(max_workers=args.workers)
     anomalies = analyzer.scan_and_analyze_directory(args.input_dir, args.output)
     report = analyzer.generate_report(anomalies)
 
@@ -4,18 +4,135 @@ Class File Runner - 自动化验证测试集中class文件的可运行性
 优化版本：使用流式处理避免内存堆积
 """
 
+import asyncio
+import locale
 import os
 import sys
 import tempfile
 import shutil
+import signal
 import subprocess
 import time
 import argparse
 import json
+import logging
+import logging.handlers
+import queue
+import threading
+import weakref
+from functools import lru_cache
 from pathlib import Path
-from sys import stderr
-from typing import List, Dict, Tuple
+from typing import List, Dict, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+logger = logging.getLogger(__name__)
+
+# 类路径和FOP基准测试用到的目录和文件，均相对于本文件所在目录
+_SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+_GCOBJ_DIR = os.path.join(_SRC_DIR, "..")  # 上级目录
+_ECLIPSE_DIR = os.path.join(_SRC_DIR, "../../benchmarks/eclipse-dacapo")
+_FOP_DIR = os.path.join(_SRC_DIR, "../../benchmarks/fop-dacapo")
+_FOP_PACKAGE = "org.apache.fop.cli"
+_FOP_CLASS_PATH = (f"{_FOP_DIR}/*", f"{_FOP_DIR}/lib/*")
+_FOP_JVM_ARGS = (
+    "-Dfop.home=" + _FOP_DIR,
+    "-Djava.awt.headless=true",
+    "-Dorg.apache.fop.allow-external-dtd=true",
+)
+_FOP_XML_FILE = os.path.join(_FOP_DIR, "name.xml")
+_FOP_XSL_FILE = os.path.join(_FOP_DIR, "name2fo.xsl")
+_FOP_PDF_FILE = os.path.join(_FOP_DIR, "output.pdf")
+
+
+@lru_cache(maxsize=128)
+def _command_template(package_name: str, class_name: str) -> Tuple[str, Tuple[str, ...], Tuple[str, ...], Tuple[str, ...]]:
+    """
+    生成同一个类的各次运行共用的命令片段，按(包名, 类名)缓存
+
+    Returns:
+        Tuple: (完整类名, 位于临时目录之后的类路径, 额外的JVM参数, 额外的程序参数)
+    """
+    # 构建完整的类名
+    if package_name:
+        full_class_name = f"{package_name}.{class_name}"
+    else:
+        full_class_name = class_name
+
+    if package_name != _FOP_PACKAGE:
+        class_path_tail = (_ECLIPSE_DIR,) if class_name == "EclipseStarter" else ()
+        return full_class_name, class_path_tail, (), ()
+
+    # 如果是FOP，使用现有的测试文件（检查文件是否存在）
+    java_args = ()
+    if os.path.exists(_FOP_XML_FILE) and os.path.exists(_FOP_XSL_FILE):
+        # 使用XML + XSL转换模式
+        java_args = (
+            "-xml", _FOP_XML_FILE,  # 输入XML文件
+            "-xsl", _FOP_XSL_FILE,  # XSLT样式表
+            "-pdf", _FOP_PDF_FILE  # 输出PDF
+        )
+    return full_class_name, _FOP_CLASS_PATH, _FOP_JVM_ARGS, java_args
+
+
+def _decode_output(data: bytes) -> str:
+    """
+    按与subprocess文本模式相同的方式解码子进程输出（本地编码、统一换行符）
+    """
+    text = data.decode(locale.getpreferredencoding(False))
+    return text.replace("\r\n", "\n").replace("\r", "\n")
+
+
+class _BatchedStreamHandler(logging.StreamHandler):
+    """
+    写入日志后不立即flush，由 _FlushingQueueListener 在队列清空时统一flush
+    """
 
+    def emit(self, record):
+        try:
+            self.stream.write(self.format(record) + self.terminator)
+        except Exception:
+            self.handleError(record)
+
+
+class _FlushingQueueListener(logging.handlers.QueueListener):
+    """
+    后台日志线程：队列中还有日志时连续写入，队列清空、即将阻塞等待时才flush输出
+    """
+
+    def dequeue(self, block):
+        if block and self.queue.empty():
+            for handler in self.handlers:
+                handler.flush()
+        return self.queue.get(block)
+
+
+def setup_logging() -> logging.handlers.QueueListener:
+    """
+    配置进度输出：各线程只把日志放入队列，由后台线程批量写到标准输出
+
+    Returns:
+        QueueListener: 已启动的后台日志线程，退出前需调用stop()以写出剩余日志
+    """
+    # 标准输出改为块缓冲，由日志线程决定何时flush
+    if hasattr(sys.stdout, "reconfigure"):
+        sys.stdout.reconfigure(line_buffering=False)
+
+    handler = _BatchedStreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+
+    log_queue = queue.SimpleQueue()
+    listener = _FlushingQueueListener(log_queue, handler)
+    # QueueHandler在入队前完成格式化，因此它也只输出消息本身
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.setFormatter(logging.Formatter("%(message)s"))
+    logging.basicConfig(level=logging.INFO, handlers=[queue_handler])
+    listener.start()
+    return listener
 
 class ClassFileRunner:
     def __init__(self, timeout_seconds=10):
@@ -24,8 +141,32 @@ class ClassFileRunner:
         self.success_count = 0
         self.fail_count = 0
         self.total_duration = 0
-        # 用于报告的成功文件列表（只存储路径，不存储完整结果）
-        self.successful_files = []
+        # 用于报告的成功文件路径（只存储路径，不存储完整结果）：每个路径编码为一行JSON字符串写入临时文件，
+        # 不在内存中累积，最终复制和生成报告时再逐行读回
+        self._success_log = tempfile.TemporaryFile("w+", encoding="utf-8", buffering=1024 * 1024)
+        # 多线程并发调用test_class_file时保护统计信息
+        self._stats_lock = threading.Lock()
+        # 用于把JVM绑定到指定CPU的taskset命令，不存在时不绑定
+        self._taskset = shutil.which("taskset")
+        # 用于让JVM在独立会话（进程组）中运行的setsid命令：超时或中断时可以杀掉整个进程组。
+        # 与taskset一样通过外部命令实现，不使用start_new_session，以免subprocess放弃posix_spawn；
+        # 子进程不是进程组组长，setsid直接exec，不会再fork，JVM的PID即进程组ID
+        self._setsid = shutil.which("setsid")
+        # 正在运行的JVM进程，被用户中断时统一杀掉（独立会话中的进程收不到终端的Ctrl-C）
+        self._running_processes = set()
+        # 用户中断后置为True：不再启动新的JVM
+        self.interrupted = False
+        # 启动时解析PATH中java的绝对路径：subprocess只有在可执行文件为绝对路径时才会走posix_spawn
+        self._default_java = shutil.which("java") or "java"
+        # 临时目录的根目录：优先使用内存文件系统/dev/shm，创建和删除临时文件都不落盘；不可用时使用系统默认临时目录
+        self.tmp_root = "/dev/shm" if os.path.isdir("/dev/shm") and os.access("/dev/shm", os.W_OK) else None
+        # 输出目录中已确认存在的目录，避免对同一目录重复mkdir
+        self._created_dirs = set()
+        # 类文件的暂存目录都建在同一个根目录下，用完后只删除放入的类文件，目录放回空闲列表供后续测试复用，
+        # 对象回收或进程退出时再整体删除
+        self._staging_root = tempfile.mkdtemp(prefix="class_run_", dir=self.tmp_root)
+        weakref.finalize(self, shutil.rmtree, self._staging_root, ignore_errors=True)
+        self._free_staging_dirs = []
 
     def extract_package_and_classname(self, directory_name: str, class_file: str) -> Tuple[str, str]:
         """
@@ -44,123 +185,228 @@ class ClassFileRunner:
 
     def create_temp_class_structure(self, class_file_path: Path, package_name: str, class_name: str) -> str:
         """
-        创建临时的类目录结构并返回临时目录路径
+        创建临时的类目录结构并返回临时目录路径，用完后需调用release_temp_class_structure归还
         """
-        temp_dir = tempfile.mkdtemp(prefix="class_run_")
+        # 优先复用空闲的暂存目录（list.pop和append是原子操作，多线程下无需额外加锁）
+        try:
+            temp_dir = self._free_staging_dirs.pop()
+        except IndexError:
+            temp_dir = tempfile.mkdtemp(dir=self._staging_root)
 
+        class_file_dest = self._staged_class_file(temp_dir, package_name, class_name)
         if package_name:
-            # 创建包目录结构
-            package_path = Path(temp_dir) / package_name.replace('.', '/')
-            package_path.mkdir(parents=True, exist_ok=True)
-            class_file_dest = package_path / f"{class_name}.class"
-        else:
-            # 没有包的情况，直接放在根目录
-            class_file_dest = Path(temp_dir) / f"{class_name}.class"
+            # 创建包目录结构（复用的目录中可能已经存在）
+            class_file_dest.parent.mkdir(parents=True, exist_ok=True)
 
-        # 复制类文件到正确位置
-        shutil.copy2(class_file_path, class_file_dest)
+        # 用符号链接代替复制类文件；文件系统不支持符号链接时再复制
+        try:
+            os.symlink(os.path.abspath(class_file_path), class_file_dest)
+        except OSError:
+            shutil.copy2(class_file_path, class_file_dest)
 
         return temp_dir
 
-    def run_java_class(self, temp_dir: str, package_name: str, class_name: str, jvm_args: List[str] = None, 
-                        enable_gc_logging: bool = False, gc_log_file: str = None) -> Tuple[
-        bool, str, int, str]:
+    def release_temp_class_structure(self, temp_dir: str, package_name: str, class_name: str):
         """
-        运行Java类文件，返回(是否成功, 输出信息, 退出码, 完整命令)
+        删除暂存目录中放入的类文件，并把目录放回空闲列表
 
-        Args:
-            temp_dir: 临时目录路径
-            package_name: 包名
-            class_name: 类名
-            jvm_args: JVM参数列表，例如 ["-XX:+UseParallelGC", "-Xmx512m"]
-            enable_gc_logging: 是否启用GC日志记录
-            gc_log_file: GC日志文件路径
+        留下的空包目录不含类文件，不影响之后在该目录中运行的其他类
+        """
+        try:
+            os.unlink(self._staged_class_file(temp_dir, package_name, class_name))
+        except OSError:
+            # 无法确认目录已经清空时不再复用
+            shutil.rmtree(temp_dir, ignore_errors=True)
+            return
+        self._free_staging_dirs.append(temp_dir)
+
+    @staticmethod
+    def _staged_class_file(temp_dir: str, package_name: str, class_name: str) -> Path:
+        """
+        返回类文件在暂存目录中的位置：有包名时放在包目录结构中，没有包时直接放在根目录
         """
-        # 构建完整的类名
         if package_name:
-            full_class_name = f"{package_name}.{class_name}"
-        else:
-            full_class_name = class_name
+            return Path(temp_dir) / package_name.replace('.', '/') / f"{class_name}.class"
+        return Path(temp_dir) / f"{class_name}.class"
 
-        # 获取当前文件的目录
-        current_dir = os.path.dirname(os.path.abspath(__file__))
+    def build_java_command(self, temp_dir: str, package_name: str, class_name: str, jvm_args: List[str] = None,
+                           enable_gc_logging: bool = False, gc_log_file: str = None,
+                           java_bin: str = None, cpu_affinity: int = None) -> List[str]:
+        """
+        构建运行Java类文件的完整命令，参数含义同run_java_class
+        """
+        # 类名、类路径和FOP参数只取决于包名和类名，多次运行同一个类时直接复用
+        full_class_name, class_path_tail, extra_jvm_args, extra_java_args = _command_template(package_name, class_name)
+        class_path = os.pathsep.join((_GCOBJ_DIR, temp_dir) + class_path_tail)
 
-        # 从当前文件位置构建相对路径
-        gcobj_dir = os.path.join(current_dir, "..")  # 上级目录
-        eclipse_dir = os.path.join(current_dir, "../../benchmarks/eclipse-dacapo")
-        fop_dir = os.path.join(current_dir, "../../benchmarks/fop-dacapo")  
+        # 添加GC日志参数
+        # 针对不同JDK版本使用不同的GC日志参数
+        # JDK 9+ 使用新的 -Xlog 参数格式，但为了兼容性也支持旧格式
+        gc_args = (f"-Xlog:gc*:file={gc_log_file}:time,uptime,level,tags",) if enable_gc_logging and gc_log_file else ()
 
-        if class_name == "EclipseStarter":
-            class_path = f"{gcobj_dir}:{temp_dir}:{eclipse_dir}"
-        elif package_name == "org.apache.fop.cli":
-            class_path = f"{gcobj_dir}:{temp_dir}:{fop_dir}/*:{fop_dir}/lib/*"
-        else:
-            class_path = f"{gcobj_dir}:{temp_dir}"
+        # 构建完整的命令：java [JVM参数] -cp class_path full_class_name
+        # -XX:-UsePerfData：不创建hsperfdata共享内存文件，减少每次JVM启动和退出的开销，不影响GC行为
+        cmd = [java_bin or self._default_java, "-Xms256m", "-Xmx4g", "-XX:-UsePerfData",
+               *extra_jvm_args, *gc_args, *(jvm_args or ()),
+               "-cp", class_path, full_class_name, *extra_java_args]
 
-        # 如果 jvm_args 为 None，设置为空列表
-        if jvm_args is None:
-            jvm_args = []
+        # 绑定CPU，避免并发运行的多个JVM相互抢占
+        if cpu_affinity is not None and self._taskset:
+            cmd = [self._taskset, "-c", str(cpu_affinity)] + cmd
 
-        # 添加GC日志参数
-        if enable_gc_logging and gc_log_file:
-            # 针对不同JDK版本使用不同的GC日志参数
-            # JDK 9+ 使用新的 -Xlog 参数格式，但为了兼容性也支持旧格式
-            gc_args = [f"-Xlog:gc*:file={gc_log_file}:time,uptime,level,tags"]
+        return cmd
 
-            jvm_args =gc_args + jvm_args
+    @staticmethod
+    def _interpret_exit(cmd: List[str], exit_code: int, stdout: str, stderr: str) -> Tuple[bool, str, int, str]:
+        """
+        根据JVM退出码和输出构建(是否成功, 输出信息, 退出码, 完整命令)
+        """
+        # 构建完整命令字符串用于返回
+        full_cmd = ' '.join(cmd)
+
+        if exit_code == 0:
+            return True, stdout.strip(), exit_code, full_cmd
+        else:
+            error_msg = stderr.strip() if stderr else stdout.strip()
+            return False, error_msg, exit_code, full_cmd
+
+    def _timeout_result(self, cmd: List[str]) -> Tuple[bool, str, int, str]:
+        """
+        JVM运行超时被终止时的(是否成功, 输出信息, 退出码, 完整命令)
+        """
+        return False, f"Timeout after {self.timeout_seconds} seconds", -1, ' '.join(cmd)
+
+    @staticmethod
+    def _interrupted_result(cmd: List[str]) -> Tuple[bool, str, int, str]:
+        """
+        用户中断后不再启动JVM时的(是否成功, 输出信息, 退出码, 完整命令)
+        """
+        return False, "Interrupted by user", -1, ' '.join(cmd)
 
-        if package_name == "org.apache.fop.cli":
-            jvm_args = [
-                           "-Dfop.home=" + fop_dir,
-                           "-Djava.awt.headless=true",
-                           "-Dorg.apache.fop.allow-external-dtd=true"
-                       ] + jvm_args
+    def _session_command(self, cmd: List[str]) -> List[str]:
+        """
+        返回实际启动的命令：有setsid时让JVM在独立的进程组中运行（结果中记录的仍是原命令）
+        """
+        if self._setsid:
+            return [self._setsid] + cmd
+        return cmd
 
+    def _kill_process_group(self, process):
+        """
+        杀掉JVM及其派生的所有子进程；没有通过setsid启动时只能杀掉JVM本身
+        """
         try:
-            # 构建完整的命令：java [JVM参数] -cp class_path full_class_name
-            cmd = ["java"] + ["-Xms256m","-Xmx4g"]+ jvm_args + ["-cp", class_path, full_class_name]
-
-            # 如果是FOP，使用现有的测试文件
-            if package_name == "org.apache.fop.cli":
-                
-                # 检查文件是否存在
-                xml_file = os.path.join(fop_dir, "name.xml")
-                xsl_file = os.path.join(fop_dir, "name2fo.xsl")
-                pdf_file = os.path.join(fop_dir, "output.pdf")
-
-                if os.path.exists(xml_file) and os.path.exists(xsl_file):
-                    # 使用XML + XSL转换模式
-                    cmd.extend([
-                        "-xml", xml_file,  # 输入XML文件
-                        "-xsl", xsl_file,  # XSLT样式表
-                        "-pdf", pdf_file  # 输出PDF
-                    ])
+            if self._setsid:
+                os.killpg(process.pid, signal.SIGKILL)
+            else:
+                process.kill()
+        except ProcessLookupError:
+            # 进程已经退出
+            pass
+
+    def kill_running_processes(self):
+        """
+        杀掉所有仍在运行的JVM进程组，用于用户中断测试时；之后的运行请求直接返回中断结果，不再启动JVM
+        """
+        self.interrupted = True
+        for process in tuple(self._running_processes):
+            if process.returncode is None:
+                self._kill_process_group(process)
 
+    def _start_process(self, process):
+        """
+        登记刚启动的JVM进程；如果在启动期间已被用户中断，则立即杀掉
+        """
+        self._running_processes.add(process)
+        if self.interrupted:
+            self._kill_process_group(process)
+
+    def run_java_class(self, temp_dir: str, package_name: str, class_name: str, jvm_args: List[str] = None, 
+                        enable_gc_logging: bool = False, gc_log_file: str = None,
+                        java_bin: str = None, cpu_affinity: int = None) -> Tuple[
+        bool, str, int, str]:
+        """
+        运行Java类文件，返回(是否成功, 输出信息, 退出码, 完整命令)
+
+        Args:
+            temp_dir: 放入类路径的目录（临时目录，或类文件所在的目录）
+            package_name: 包名
+            class_name: 类名
+            jvm_args: JVM参数列表，例如 ["-XX:+UseParallelGC", "-Xmx512m"]
+            enable_gc_logging: 是否启用GC日志记录
+            gc_log_file: GC日志文件路径
+            java_bin: java可执行文件路径，默认使用PATH中的java
+            cpu_affinity: 如果提供，通过taskset把JVM绑定到该CPU上运行
+        """
+        try:
+            cmd = self.build_java_command(temp_dir, package_name, class_name, jvm_args,
+                                          enable_gc_logging, gc_log_file, java_bin, cpu_affinity)
+            if self.interrupted:
+                return self._interrupted_result(cmd)
 
             # 设置超时
+            # 可执行文件为绝对路径、close_fds=False且不使用preexec_fn/shell时，
+            # subprocess会用posix_spawn（glibc上基于vfork）代替fork+exec启动JVM；
+            # 因此CPU绑定通过外部taskset命令实现，而不是preexec_fn
             process = subprocess.Popen(
-                cmd,
+                self._session_command(cmd),
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
-                text=True
+                text=True,
+                close_fds=False
             )
+            self._start_process(process)
 
             try:
                 stdout, stderr = process.communicate(timeout=self.timeout_seconds)
-                exit_code = process.returncode
-                # 构建完整命令字符串用于返回
-                full_cmd = ' '.join(cmd)
-
-                if process.returncode == 0:
-                    return True, stdout.strip(), exit_code, full_cmd
-                else:
-                    error_msg = stderr.strip() if stderr else stdout.strip()
-                    return False, error_msg, exit_code, full_cmd
+                return self._interpret_exit(cmd, process.returncode, stdout, stderr)
 
             except subprocess.TimeoutExpired:
-                process.kill()
-                full_cmd = ' '.join(cmd)
-                return False, f"Timeout after {self.timeout_seconds} seconds", -1, full_cmd
+                self._kill_process_group(process)
+                try:
+                    process.wait(timeout=2)
+                except subprocess.TimeoutExpired:
+                    pass
+                return self._timeout_result(cmd)
+
+            finally:
+                self._running_processes.discard(process)
+
+        except Exception as e:
+            return False, f"Execution error: {str(e)}", -1, ""
+
+    async def run_java_class_async(self, temp_dir: str, package_name: str, class_name: str,
+                                   jvm_args: List[str] = None, enable_gc_logging: bool = False,
+                                   gc_log_file: str = None, java_bin: str = None,
+                                   cpu_affinity: int = None) -> Tuple[bool, str, int, str]:
+        """
+        run_java_class的异步版本：通过asyncio子进程运行，等待JVM期间不占用线程
+        """
+        try:
+            cmd = self.build_java_command(temp_dir, package_name, class_name, jvm_args,
+                                          enable_gc_logging, gc_log_file, java_bin, cpu_affinity)
+            if self.interrupted:
+                return self._interrupted_result(cmd)
+
+            process = await asyncio.create_subprocess_exec(
+                *self._session_command(cmd),
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                close_fds=False
+            )
+            self._start_process(process)
+
+            try:
+                stdout, stderr = await asyncio.wait_for(process.communicate(), timeout=self.timeout_seconds)
+                return self._interpret_exit(cmd, process.returncode, _decode_output(stdout), _decode_output(stderr))
+
+            except asyncio.TimeoutError:
+                self._kill_process_group(process)
+                await process.wait()
+                return self._timeout_result(cmd)
+
+            finally:
+                self._running_processes.discard(process)
 
         except Exception as e:
             return False, f"Execution error: {str(e)}", -1, ""
@@ -168,7 +414,7 @@ class ClassFileRunner:
     def test_class_file(self, class_file_path: Path, parent_directory: str,
                         jvm_args: List[str] = None, output_dir: str = None,
                         source_base_dir: str = None, enable_gc_logging: bool = False, 
-                        gc_log_file: str = None) -> Dict:
+                        gc_log_file: str = None, java_bin: str = None, cpu_affinity: int = None) -> Dict:
         """
         测试单个类文件的可运行性，支持流式输出
 
@@ -180,68 +426,131 @@ class ClassFileRunner:
             source_base_dir: 源基础目录，用于保持目录结构
             enable_gc_logging: 是否启用GC日志记录
             gc_log_file: GC日志文件路径
+            java_bin: java可执行文件路径，默认使用PATH中的java
+            cpu_affinity: 如果提供，把JVM绑定到该CPU上运行
         """
-        print(f"Testing: {class_file_path}")
+        package_name, class_name, class_dir, temp_dir = self._prepare_test(class_file_path, parent_directory)
 
-        # 提取包名和类名
-        package_name, class_name = self.extract_package_and_classname(
-            parent_directory, class_file_path.name
-        )
+        try:
+            # 记录开始时间
+            start_time = time.time()
 
-        # 创建临时目录结构
-        temp_dir = self.create_temp_class_structure(class_file_path, package_name, class_name)
+            # 运行测试
+            run_result = self.run_java_class(
+                class_dir, package_name, class_name, jvm_args, enable_gc_logging, gc_log_file, java_bin,
+                cpu_affinity
+            )
+
+            return self._record_result(class_file_path, package_name, class_name, run_result, start_time,
+                                       output_dir, source_base_dir)
+
+        finally:
+            # 归还临时目录（直接使用类文件所在目录时没有临时目录）
+            if temp_dir is not None:
+                self.release_temp_class_structure(temp_dir, package_name, class_name)
+
+    async def test_class_file_async(self, class_file_path: Path, parent_directory: str,
+                                    jvm_args: List[str] = None, output_dir: str = None,
+                                    source_base_dir: str = None, enable_gc_logging: bool = False,
+                                    gc_log_file: str = None, java_bin: str = None,
+                                    cpu_affinity: int = None) -> Dict:
+        """
+        test_class_file的异步版本，参数和返回值相同
+        """
+        package_name, class_name, class_dir, temp_dir = self._prepare_test(class_file_path, parent_directory)
 
         try:
             # 记录开始时间
             start_time = time.time()
 
             # 运行测试
-            success, output, exit_code, full_cmd = self.run_java_class(
-                temp_dir, package_name, class_name, jvm_args, enable_gc_logging, gc_log_file
+            run_result = await self.run_java_class_async(
+                class_dir, package_name, class_name, jvm_args, enable_gc_logging, gc_log_file, java_bin,
+                cpu_affinity
             )
 
-            # 截断输出，只保留前1024个字符
-            if output and len(output) > 1024:
-                output = output[:1024]
+            return self._record_result(class_file_path, package_name, class_name, run_result, start_time,
+                                       output_dir, source_base_dir)
+
+        finally:
+            # 归还临时目录（直接使用类文件所在目录时没有临时目录）
+            if temp_dir is not None:
+                self.release_temp_class_structure(temp_dir, package_name, class_name)
+
+    def _prepare_test(self, class_file_path: Path, parent_directory: str) -> Tuple[str, str, str, Optional[str]]:
+        """
+        准备运行单个类文件：提取包名和类名，确定放入类路径的目录
+
+        Returns:
+            Tuple[str, str, str, Optional[str]]: (包名, 类名, 类路径目录, 运行结束后需要归还的临时目录或None)
+        """
+        logger.info(f"Testing: {class_file_path}")
+
+        # 提取包名和类名
+        package_name, class_name = self.extract_package_and_classname(
+            parent_directory, class_file_path.name
+        )
+
+        # 没有包名、文件名就是类名且所在目录中只有这一个文件时，该目录本身就是正确的类路径，无需创建临时目录；
+        # 目录中还有其他文件时仍单独暂存，避免同目录的其他类文件遮蔽或满足被测类的引用
+        if (not package_name and class_file_path.name == f"{class_name}.class"
+                and os.listdir(class_file_path.parent) == [class_file_path.name]):
+            return package_name, class_name, os.path.abspath(class_file_path.parent), None
+
+        # 创建临时目录结构
+        temp_dir = self.create_temp_class_structure(class_file_path, package_name, class_name)
+        return package_name, class_name, temp_dir, temp_dir
+
+    def _record_result(self, class_file_path: Path, package_name: str, class_name: str,
+                       run_result: Tuple[bool, str, int, str], start_time: float,
+                       output_dir: str = None, source_base_dir: str = None) -> Dict:
+        """
+        根据运行结果更新统计信息、复制成功文件并构建结果字典
+        """
+        success, output, exit_code, full_cmd = run_result
+
+        # 截断输出，只保留前1024个字符
+        if output and len(output) > 1024:
+            output = output[:1024]
 
-            # 计算运行时长（毫秒）
-            end_time = time.time()
-            duration_ms = int((end_time - start_time) * 1000)
+        # 计算运行时长（毫秒）
+        end_time = time.time()
+        duration_ms = int((end_time - start_time) * 1000)
 
-            # 更新统计信息
+        # 更新统计信息
+        with self._stats_lock:
             if success:
                 self.success_count += 1
-                self.successful_files.append(str(class_file_path))
-                # 如果提供了输出目录，立即复制成功文件
-                if output_dir and source_base_dir:
-                    self._copy_successful_file_immediately(class_file_path, output_dir, source_base_dir)
+                self._success_log.write(json.dumps(str(class_file_path), ensure_ascii=False) + "\n")
             else:
                 self.fail_count += 1
 
             self.total_duration += duration_ms
 
-            result = {
-                "class_file": str(class_file_path),
-                "package": package_name,
-                "class_name": class_name,
-                "success": success,
-                "output": output,
-                "exit_code": exit_code,
-                "duration_ms": duration_ms,
-                "full_cmd": full_cmd
-            }
-
-            status = "✓ SUCCESS" if success else "✗ FAILED"
-            full_class_name = f"{package_name}.{class_name}" if package_name else class_name
-            print(f"  {status}: {full_class_name} (耗时: {duration_ms}ms)")
-            if not success and output:
-                print(f"    Error: {output}")
-
-            return result
-
-        finally:
-            # 清理临时目录
-            shutil.rmtree(temp_dir, ignore_errors=True)
+        # 如果提供了输出目录，立即复制成功文件
+        if success and output_dir and source_base_dir:
+            self._copy_successful_file_immediately(class_file_path, output_dir, source_base_dir)
+
+        result = {
+            "class_file": str(class_file_path),
+            "package": package_name,
+            "class_name": class_name,
+            "success": success,
+            "output": output,
+            "exit_code": exit_code,
+            "duration_ms": duration_ms,
+            "full_cmd": full_cmd
+        }
+
+        status = "✓ SUCCESS" if success else "✗ FAILED"
+        full_class_name = f"{package_name}.{class_name}" if package_name else class_name
+        lines = [f"  {status}: {full_class_name} (耗时: {duration_ms}ms)"]
+        if not success and output:
+            lines.append(f"    Error: {output}")
+        # 同一个结果的多行信息作为一条日志写出，并发测试时不会与其他结果交错
+        logger.info("\n".join(lines))
+
+        return result
 
     def _copy_successful_file_immediately(self, source_file: Path, output_dir: str, source_base_dir: str):
         """立即复制成功的文件到输出目录，保持原始目录结构"""
@@ -252,46 +561,110 @@ class ClassFileRunner:
             # 构建目标文件路径（保持完整的相对路径）
             dest_file = Path(output_dir) / relative_path
 
-            # 确保目标目录存在
+            # 复制文件
+            self._link_or_copy(source_file, dest_file)
+            logger.info(f"  ↳ Copied to: {relative_path}")
+        except Exception as e:
+            logger.info(f"  ↳ Error copying file {source_file}: {e}")
+
+    def _link_or_copy(self, source_file: Path, dest_file: Path):
+        """
+        把类文件放到输出目录：优先创建硬链接，不复制文件内容；跨文件系统等无法链接时再复制
+        """
+        # 确保目标目录存在，已创建过的目录不再重复调用mkdir
+        if dest_file.parent not in self._created_dirs:
             dest_file.parent.mkdir(parents=True, exist_ok=True)
+            self._created_dirs.add(dest_file.parent)
 
-            # 复制文件
+        try:
+            os.link(source_file, dest_file)
+        except FileExistsError:
+            # 目标已存在：已经是同一个文件时无需处理，否则与原来一样用源文件覆盖
+            if not os.path.samefile(source_file, dest_file):
+                shutil.copy2(source_file, dest_file)
+        except OSError:
             shutil.copy2(source_file, dest_file)
-            print(f"  ↳ Copied to: {relative_path}")
-        except Exception as e:
-            print(f"  ↳ Error copying file {source_file}: {e}")
 
-    def scan_and_test_directory(self, base_dir: str, output_dir: str = None):
+    def scan_and_test_directory(self, base_dir: str, output_dir: str = None, max_workers: int = None):
         """
-        递归扫描目录并测试所有.class文件，支持流式输出
+        递归扫描目录并并发测试所有.class文件，支持流式输出
 
         Args:
             base_dir: 基础目录
             output_dir: 如果提供，成功时立即复制文件
+            max_workers: 同时运行的JVM数量，默认与CPU核数一致
         """
-        base_path = Path(base_dir)
+        # 所有JVM子进程都由一个事件循环等待，不再为每个运行中的JVM占用一个线程
+        loop = asyncio.new_event_loop()
+        try:
+            loop.run_until_complete(self._scan_and_test_async(base_dir, output_dir, max_workers or os.cpu_count() or 1))
+        finally:
+            loop.close()
 
-        for item in base_path.rglob('*'):
-            if item.is_file() and item.suffix == '.class':
-                # 获取父目录名
-                parent_dir = item.parent.name
+    async def _scan_and_test_async(self, base_dir: str, output_dir: str, max_workers: int):
+        """
+        边遍历目录边测试类文件，同时运行的JVM数量不超过max_workers
+        """
+        # 取到信号量后才创建测试任务，目录遍历不会远远跑在测试前面
+        slots = asyncio.Semaphore(max_workers)
+        tasks = []
+        for item, parent_dir in self._iter_class_files(base_dir):
+            await slots.acquire()
+            # 测试这个类文件，如果output_dir不为None则立即复制成功文件
+            task = asyncio.ensure_future(self.test_class_file_async(item, parent_dir, output_dir=output_dir,
+                                                                    source_base_dir=base_dir))
+            task.add_done_callback(lambda _: slots.release())
+            tasks.append(task)
+
+        # 等待剩余的测试完成，并传播其中的异常
+        await asyncio.gather(*tasks)
+
+    @staticmethod
+    def _iter_class_files(base_dir: str):
+        """
+        用os.scandir递归遍历目录树，逐个返回(类文件路径, 父目录名)
 
-                # 跳过以@结尾的目录（可能是临时目录）
-                if parent_dir.endswith('@'):
-                    continue
+        只为.class文件构造Path对象，其他目录项不会被保存
+        """
+        parent_dir = os.path.basename(os.path.normpath(base_dir))
+        with os.scandir(base_dir) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    yield from ClassFileRunner._iter_class_files(entry.path)
+                # 跳过以@结尾的目录（可能是临时目录）中的类文件
+                elif entry.name.endswith('.class') and entry.is_file() and not parent_dir.endswith('@'):
+                    yield Path(entry.path), parent_dir
+
+    def iter_successful_files(self):
+        """
+        按测试完成的顺序逐个返回成功的类文件路径
+        """
+        for line in self._iter_success_log():
+            yield json.loads(line)
 
-                # 测试这个类文件，如果output_dir不为None则立即复制成功文件
-                result = self.test_class_file(item, parent_dir, output_dir=output_dir, source_base_dir=base_dir)
+    def _iter_success_log(self):
+        """
+        按测试完成的顺序逐行返回临时文件中记录的成功文件路径（JSON字符串，不含换行符）
+        """
+        with self._stats_lock:
+            self._success_log.flush()
+            self._success_log.seek(0)
+            try:
+                for line in self._success_log:
+                    yield line.rstrip("\n")
+            finally:
+                # 回到文件末尾，之后的成功文件继续追加
+                self._success_log.seek(0, os.SEEK_END)
 
     def filter_successful_tests(self, source_dir: str, output_dir: str):
         """
         过滤成功的测试用例并输出到指定目录，保留原始目录结构
         注意：此方法现在主要用于批量模式，流式模式下文件已实时复制
         """
-        print(f"\nFinal copy: {len(self.successful_files)} successful test cases to: {output_dir}")
+        logger.info(f"\nFinal copy: {self.success_count} successful test cases to: {output_dir}")
 
         copied_count = 0
-        for source_file_path in self.successful_files:
+        for source_file_path in self.iter_successful_files():
             source_file = Path(source_file_path)
 
             # 计算相对于源目录的相对路径
@@ -304,16 +677,13 @@ class ClassFileRunner:
             # 构建目标文件路径
             dest_file = Path(output_dir) / relative_path
 
-            # 确保目标目录存在
-            dest_file.parent.mkdir(parents=True, exist_ok=True)
-
             # 复制文件（如果尚未复制）
             if not dest_file.exists():
-                shutil.copy2(source_file, dest_file)
+                self._link_or_copy(source_file, dest_file)
                 copied_count += 1
-                print(f"  Copied: {relative_path}")
+                logger.info(f"  Copied: {relative_path}")
 
-        print(f"Successfully copied {copied_count} files to {output_dir}")
+        logger.info(f"Successfully copied {copied_count} files to {output_dir}")
 
     def generate_report(self, output_file: str = None):
         """
@@ -321,20 +691,23 @@ class ClassFileRunner:
         """
         total = self.success_count + self.fail_count
 
-        print("\n" + "=" * 60)
-        print("TEST REPORT")
-        print("=" * 60)
-        print(f"Total class files tested: {total}")
-        print(f"Successful: {self.success_count}")
-        print(f"Failed: {self.fail_count}")
+        lines = [
+            "\n" + "=" * 60,
+            "TEST REPORT",
+            "=" * 60,
+            f"Total class files tested: {total}",
+            f"Successful: {self.success_count}",
+            f"Failed: {self.fail_count}",
+        ]
         if total > 0:
             success_rate = self.success_count / total * 100
             avg_duration = self.total_duration / total if total > 0 else 0
-            print(f"Success rate: {success_rate:.2f}%")
-            print(f"Average duration: {avg_duration:.2f}ms")
+            lines.append(f"Success rate: {success_rate:.2f}%")
+            lines.append(f"Average duration: {avg_duration:.2f}ms")
         else:
-            print("Success rate: 0.00%")
-            print("Average duration: 0.00ms")
+            lines.append("Success rate: 0.00%")
+            lines.append("Average duration: 0.00ms")
+        logger.info("\n".join(lines))
 
         # 保存简要结果到文件
         if output_file:
@@ -347,12 +720,24 @@ class ClassFileRunner:
                     'total_duration_ms': self.total_duration,
                     'average_duration_ms': self.total_duration / total if total > 0 else 0
                 },
-                'successful_files': self.successful_files
+                'successful_files': []
             }
 
+            # 安装了orjson时优先使用orjson序列化报告头部
+            if orjson is not None:
+                head = orjson.dumps(report_data, option=orjson.OPT_INDENT_2).decode('utf-8')
+            else:
+                head = json.dumps(report_data, indent=2, ensure_ascii=False)
+            # 成功文件列表从临时文件逐行读出写入报告，输出格式与json.dump(indent=2)相同；
+            # 临时文件中的每一行本身就是编码好的JSON字符串，直接写入，无需解码再重新编码
             with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(report_data, f, indent=2, ensure_ascii=False)
-            print(f"\nReport saved to: {output_file}")
+                f.write(head[:head.rindex('[]')])
+                separator = "[\n    "
+                for encoded_path in self._iter_success_log():
+                    f.write(separator + encoded_path)
+                    separator = ",\n    "
+                f.write("[]\n}" if separator.startswith("[") else "\n  ]\n}")
+            logger.info(f"\nReport saved to: {output_file}")
 
 
 def main():
@@ -363,53 +748,61 @@ def main():
     parser.add_argument('-r', '--report', metavar='REPORT_FILE',
                         default='class_test_report.json',
                         help='Output report file (default: class_test_report.json)')
+    parser.add_argument('-w', '--workers', type=int, default=None,
+                        help='Number of class files tested concurrently (default: number of CPUs)')
 
     args = parser.parse_args()
 
-    testcases_dir = args.testcases_dir
-    output_dir = args.filter
-    report_file = args.report
+    listener = setup_logging()
+    try:
+        testcases_dir = args.testcases_dir
+        output_dir = args.filter
+        report_file = args.report
 
-    if not os.path.exists(testcases_dir):
-        print(f"Error: Directory '{testcases_dir}' does not exist")
-        sys.exit(1)
+        if not os.path.exists(testcases_dir):
+            logger.info(f"Error: Directory '{testcases_dir}' does not exist")
+            sys.exit(1)
 
-    runner = ClassFileRunner(timeout_seconds=60)
+        runner = ClassFileRunner(timeout_seconds=60)
 
-    print(f"Scanning and testing class files in: {testcases_dir}")
-    print("This may take a while...\n")
-
-    try:
-        # 关键修改：在扫描测试时如果指定了输出目录，就立即复制成功文件
-        if output_dir:
-            # 确保输出目录存在
-            Path(output_dir).mkdir(parents=True, exist_ok=True)
-            print(f"Streaming successful files to: {output_dir}")
-            # 传递 source_base_dir 参数
-            runner.scan_and_test_directory(testcases_dir, output_dir=output_dir)
-            # 最后再做一次完整性检查，确保所有成功文件都已复制
-            runner.filter_successful_tests(testcases_dir, output_dir)
-        else:
-            # 报告模式：只测试不复制
-            runner.scan_and_test_directory(testcases_dir)
-
-        # 生成报告
-        runner.generate_report(report_file)
-
-    except KeyboardInterrupt:
-        print("\nTesting interrupted by user")
-        # 即使被中断，也输出当前进度
-        if output_dir:
-            runner.filter_successful_tests(testcases_dir, output_dir)
-        runner.generate_report(f"interrupted_{report_file}")
-    except Exception as e:
-        print(f"Error during testing: {e}")
-        # 发生错误时也尝试输出当前结果
-        if output_dir:
-            runner.filter_successful_tests(testcases_dir, output_dir)
-        runner.generate_report(f"error_{report_file}")
-        sys.exit(1)
+        logger.info(f"Scanning and testing class files in: {testcases_dir}")
+        logger.info("This may take a while...\n")
 
+        try:
+            # 关键修改：在扫描测试时如果指定了输出目录，就立即复制成功文件
+            if output_dir:
+                # 确保输出目录存在
+                Path(output_dir).mkdir(parents=True, exist_ok=True)
+                logger.info(f"Streaming successful files to: {output_dir}")
+                # 传递 source_base_dir 参数
+                runner.scan_and_test_directory(testcases_dir, output_dir=output_dir, max_workers=args.workers)
+                # 最后再做一次完整性检查，确保所有成功文件都已复制
+                runner.filter_successful_tests(testcases_dir, output_dir)
+            else:
+                # 报告模式：只测试不复制
+                runner.scan_and_test_directory(testcases_dir, max_workers=args.workers)
+
+            # 生成报告
+            runner.generate_report(report_file)
+
+        except KeyboardInterrupt:
+            logger.info("\nTesting interrupted by user")
+            runner.kill_running_processes()
+            # 即使被中断，也输出当前进度
+            if output_dir:
+                runner.filter_successful_tests(testcases_dir, output_dir)
+            runner.generate_report(f"interrupted_{report_file}")
+        except Exception as e:
+            logger.info(f"Error during testing: {e}")
+            # 发生错误时也尝试输出当前结果
+            if output_dir:
+                runner.filter_successful_tests(testcases_dir, output_dir)
+            runner.generate_report(f"error_{report_file}")
+            sys.exit(1)
+
+    finally:
+        # 写出队列中剩余的日志
+        listener.stop()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
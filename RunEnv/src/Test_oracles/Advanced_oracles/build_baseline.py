@@ -16,6 +16,12 @@ import statistics
 from collections import defaultdict
 from typing import Dict, Any, List, Optional, Tuple
 
+try:
+    from .ranking_utils import classify_gc_type
+except ImportError:
+    # 作为脚本直接运行时没有包上下文，从脚本所在目录导入
+    from ranking_utils import classify_gc_type
+
 
 # ============================================================
 # 配置
@@ -43,31 +49,6 @@ JDK_GC_SUPPORT = {
 # ============================================================
 # 工具函数
 # ============================================================
-def classify_gc_type(result: Dict[str, Any]) -> str:
-    """根据GC参数识别GC类型"""
-    gc_params = result.get("GC_parameters", [])
-    params_str = " ".join(gc_params).upper()
-    
-    if "+USESHENANDOAHGC" in params_str:
-        if "SHENANDOAHGCMODE=GENERATIONAL" in params_str:
-            return "ShenandoahGC-Gen"
-        return "ShenandoahGC"
-    elif "+USEZGC" in params_str:
-        return "ZGC"
-    elif "+USEEPSILONGC" in params_str:
-        return "EpsilonGC"
-    elif "+USEG1GC" in params_str:
-        return "G1GC"
-    elif "+USEPARALLELOLDGC" in params_str:
-        return "ParallelOldGC"
-    elif "+USEPARALLELGC" in params_str:
-        return "ParallelGC"
-    elif "+USESERIALGC" in params_str:
-        return "SerialGC"
-    else:
-        return "Unknown"
-
-
 def get_metric_value(result: Dict[str, Any], metric_type: str) -> Optional[float]:
     """从测试结果中提取指标值"""
     if metric_type == "duration_ms":
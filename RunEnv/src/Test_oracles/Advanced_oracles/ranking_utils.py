@@ -9,6 +9,7 @@ V2.1 新增：三通道鲁棒检测所需的工具函数
 - calculate_log_tail_score: log尺度尾部分数
 - calculate_rank_tail_prob_from_hist: 基于历史排名直方图的尾概率
 """
+from functools import lru_cache
 from typing import Dict, Any, List, Tuple, Optional
 from enum import Enum
 import math
@@ -47,7 +48,12 @@ def classify_gc_type(result: Dict[str, Any]) -> str:
     Returns:
         GC类型字符串
     """
-    gc_params = result.get("GC_parameters", [])
+    return _classify_gc_params(tuple(result.get("GC_parameters", [])))
+
+
+@lru_cache(maxsize=None)
+def _classify_gc_params(gc_params: Tuple[str, ...]) -> str:
+    """classify_gc_type的实现；各结果文件中的GC参数组合只有少数几种，按参数元组缓存识别结果"""
     params_str = " ".join(gc_params).upper()
     
     # 检查是否是分代ShenandoahGC
@@ -11,6 +11,8 @@ serial > G1 >= parallel >= shenandoah > ZGC
 from typing import Dict, Any, Optional
 import statistics
 
+from .gc_types import classify_gc_type
+
 
 def oracle_gc_count_anomaly(log_data: Dict[str, Any], file_path: str) -> Optional[Dict[str, Any]]:
     """
@@ -27,25 +29,6 @@ def oracle_gc_count_anomaly(log_data: Dict[str, Any], file_path: str) -> Optiona
     if not test_results:
         return None
 
-    # GC类型分类函数
-    def classify_gc_type(result: Dict[str, Any]) -> str:
-        """根据GC参数识别GC类型"""
-        gc_params = result.get("GC_parameters", [])
-        params_str = " ".join(gc_params).upper()
-        
-        if "+USEZGC" in params_str:
-            return "ZGC"
-        elif "+USESHENANDOAHGC" in params_str:
-            return "ShenandoahGC"
-        elif "+USEG1GC" in params_str:
-            return "G1GC"
-        elif "+USEPARALLELGC" in params_str or "+USEPARALLELOLDGC" in params_str:
-            return "ParallelGC"
-        elif "+USESERIALGC" in params_str:
-            return "SerialGC"
-        else:
-            return "Unknown"
-
     # 收集有效的GC结果数据（成功执行且GC count > 5）
     gc_data = []
     for result in test_results:
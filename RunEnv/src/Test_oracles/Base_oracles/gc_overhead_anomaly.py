@@ -7,9 +7,24 @@
 3. 同一JDK内，某GC的GC_overhead_ratio高于其他GC > 3倍中位数
 4. 同一GC版本升级，GC_overhead_ratio显著上升（>50%且绝对值>5%）
 """
-from typing import Dict, Any, Optional
+from collections import defaultdict
+from operator import itemgetter
+from typing import Dict, Any, Optional, Tuple
 import statistics
 
+from .gc_types import classify_gc_type
+
+# 同一JDK内对比时GC开销比例相对中位数的最小倍数阈值（未单独设置阈值的GC使用该值）
+_MIN_MEDIAN_THRESHOLD = 3
+
+
+def _parse_jdk_version(jdk_version: str) -> Optional[Tuple[int, ...]]:
+    """把JDK版本号解析为整数元组（如"17.0.2" -> (17, 0, 2)），无法解析时返回None"""
+    try:
+        return tuple(int(part) for part in str(jdk_version).split("."))
+    except ValueError:
+        return None
+
 
 def oracle_gc_overhead_anomaly(log_data: Dict[str, Any], file_path: str) -> Optional[Dict[str, Any]]:
     """
@@ -23,27 +38,11 @@ def oracle_gc_overhead_anomaly(log_data: Dict[str, Any], file_path: str) -> Opti
     if not test_results:
         return None
 
-    # 识别GC类型的函数
-    def classify_gc_type(result: Dict[str, Any]) -> str:
-        """根据GC参数识别GC类型"""
-        gc_params = result.get("GC_parameters", [])
-        params_str = " ".join(gc_params).upper()
-        
-        if "+USEZGC" in params_str:
-            return "ZGC"
-        elif "+USESHENANDOAHGC" in params_str:
-            return "ShenandoahGC"
-        elif "+USEG1GC" in params_str:
-            return "G1GC"
-        elif "+USEPARALLELGC" in params_str or "+USEPARALLELOLDGC" in params_str:
-            return "ParallelGC"
-        elif "+USESERIALGC" in params_str:
-            return "SerialGC"
-        else:
-            return "Unknown"
-
-    # 收集所有有效的GC结果数据（过滤GC次数<=10的）
-    gc_data = []
+    # 收集所有有效的GC结果数据（过滤GC次数<=10的），一次遍历同时按JDK版本和GC类型分组，
+    # 并检测GC开销比例超过100%的明显错误
+    jdk_groups = defaultdict(list)
+    gc_type_groups = defaultdict(list)
+    debug_anomalies = []
     for result in test_results:
         gc_analysis = result.get("gc_analysis")
         if not gc_analysis:
@@ -66,39 +65,33 @@ def oracle_gc_overhead_anomaly(log_data: Dict[str, Any], file_path: str) -> Opti
         # 计算GC开销比例
         gc_overhead_ratio = gc_stw_time / duration_ms if duration_ms > 0 else 0
         
-        gc_data.append({
+        data = {
             "jdk_version": jdk_version,
+            "parsed_version": _parse_jdk_version(jdk_version),
             "gc_type": gc_type,
             "gc_overhead_ratio": gc_overhead_ratio,
             "gc_overhead_percentage": gc_overhead_ratio * 100  # 转换为百分比
-        })
-
-    if not gc_data:
-        return None
-
-    anomalies = []
+        }
+        jdk_groups[jdk_version].append(data)
+        gc_type_groups[gc_type].append(data)
 
-    # DEBUG: 检测GC开销比例超过100%的明显错误
-    debug_anomalies = []
-    for data in gc_data:
-        if data["gc_overhead_ratio"] > 1.0:  # 超过100%
-            score = data["gc_overhead_ratio"]  # GC开销比例本身作为异常分数
+        # DEBUG: 检测GC开销比例超过100%的明显错误
+        if gc_overhead_ratio > 1.0:  # 超过100%
+            score = gc_overhead_ratio  # GC开销比例本身作为异常分数
             debug_anomalies.append({
                 "score": round(score, 4),  # 异常分数：GC开销比例
-                "info": f"{data['jdk_version']}-{data['gc_type']}: GC开销比例异常，GC开销比例（{data['gc_overhead_percentage']:.2f}%）超过100%，GC暂停时间大于程序总运行时间"
+                "info": f"{jdk_version}-{gc_type}: GC开销比例异常，GC开销比例（{data['gc_overhead_percentage']:.2f}%）超过100%，GC暂停时间大于程序总运行时间"
             })
+
+    if not jdk_groups:
+        return None
+
+    anomalies = []
     
     if debug_anomalies:
         anomalies.extend(debug_anomalies)
 
     # 1. 同一JDK内GC开销比例对比异常
-    jdk_groups = {}
-    for data in gc_data:
-        jdk_version = data["jdk_version"]
-        if jdk_version not in jdk_groups:
-            jdk_groups[jdk_version] = []
-        jdk_groups[jdk_version].append(data)
-
     jdk_comparison_anomalies = []
     for jdk_version, jdk_gc_data in jdk_groups.items():
         # 计算该JDK版本内所有GC的开销比例
@@ -110,9 +103,13 @@ def oracle_gc_overhead_anomaly(log_data: Dict[str, Any], file_path: str) -> Opti
         # 计算中位数
         median_ratio = statistics.median(overhead_ratios)
         
+        # 各GC的阈值最小为3倍：最大的开销比例都未超过3倍中位数时，逐个检查也不会发现异常
+        if median_ratio >= 0 and max(overhead_ratios) <= median_ratio * _MIN_MEDIAN_THRESHOLD:
+            continue
+        
         # 检查是否有GC的开销比例超过中位数阈值
         for data in jdk_gc_data:
-            threshold = 3 
+            threshold = _MIN_MEDIAN_THRESHOLD
             if data["gc_type"] == "SerialGC":
                 threshold = 20
             elif data["gc_type"] == "ParallelGC":
@@ -143,23 +140,16 @@ def oracle_gc_overhead_anomaly(log_data: Dict[str, Any], file_path: str) -> Opti
         anomalies.extend(jdk_comparison_anomalies)
 
     # 2. 同一GC类型跨JDK版本开销比例对比异常
-    gc_type_groups = {}
-    for data in gc_data:
-        gc_type = data["gc_type"]
-        if gc_type not in gc_type_groups:
-            gc_type_groups[gc_type] = []
-        gc_type_groups[gc_type].append(data)
-
     cross_version_anomalies = []
     for gc_type, gc_type_data in gc_type_groups.items():
-        # 按JDK版本排序
-        sorted_data = sorted(gc_type_data, key=lambda x: float(x["jdk_version"]) if x["jdk_version"].replace('.', '').isdigit() else 0)
+        # 按JDK版本排序；版本号无法解析的结果没有可比较的相邻版本，直接跳过
+        sorted_data = sorted(
+            (data for data in gc_type_data if data["parsed_version"] is not None),
+            key=itemgetter("parsed_version")
+        )
         
         # 检查相邻版本之间的开销比例变化
-        for i in range(1, len(sorted_data)):
-            prev_version = sorted_data[i-1]
-            curr_version = sorted_data[i]
-            
+        for prev_version, curr_version in zip(sorted_data, sorted_data[1:]):
             prev_jdk = prev_version["jdk_version"]
             curr_jdk = curr_version["jdk_version"]
             prev_overhead = prev_version["gc_overhead_ratio"]
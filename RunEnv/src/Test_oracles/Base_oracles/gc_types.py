@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+基础预言共用的GC类型识别
+同一组GC参数在所有结果文件中反复出现，识别结果按参数元组缓存
+"""
+from functools import lru_cache
+from typing import Dict, Any, Tuple
+
+
+@lru_cache(maxsize=None)
+def _classify_gc_params(gc_params: Tuple[str, ...]) -> str:
+    """classify_gc_type的实现，结果按参数元组缓存"""
+    params_str = " ".join(gc_params).upper()
+
+    if "+USEZGC" in params_str:
+        return "ZGC"
+    elif "+USESHENANDOAHGC" in params_str:
+        return "ShenandoahGC"
+    elif "+USEG1GC" in params_str:
+        return "G1GC"
+    elif "+USEPARALLELGC" in params_str or "+USEPARALLELOLDGC" in params_str:
+        return "ParallelGC"
+    elif "+USESERIALGC" in params_str:
+        return "SerialGC"
+    else:
+        return "Unknown"
+
+
+def classify_gc_type(result: Dict[str, Any]) -> str:
+    """根据测试结果的GC参数识别GC类型"""
+    return _classify_gc_params(tuple(result.get("GC_parameters", [])))
+
+
+# GC选择参数（大写） -> GC类型
+_FLAG_TO_GC = {
+    "-XX:+USEZGC": "ZGC",
+    "-XX:+USESHENANDOAHGC": "ShenandoahGC",
+    "-XX:+USEEPSILONGC": "EpsilonGC",
+    "-XX:+USEG1GC": "G1GC",
+    "-XX:+USEPARALLELGC": "ParallelGC",
+    "-XX:+USEPARALLELOLDGC": "ParallelGC",
+    "-XX:+USESERIALGC": "SerialGC",
+    "-XX:+USECONCMARKSWEEPGC": "CMS",
+    "-XX:+USEPARNEWGC": "CMS",
+}
+# 同时指定了多个GC参数时，按此顺序取第一个出现的GC类型
+_GC_PRIORITY = ("ZGC", "ShenandoahGC", "EpsilonGC", "G1GC", "ParallelGC", "SerialGC", "CMS")
+
+
+@lru_cache(maxsize=None)
+def _classify_gc_flags(jvm_parameters: Tuple[str, ...]) -> str:
+    """classify_gc的实现，结果按参数元组缓存"""
+    # 只遍历一次参数，查表得到出现过的GC类型
+    found = {_FLAG_TO_GC.get(p.upper()) for p in jvm_parameters}
+    for gc_type in _GC_PRIORITY:
+        if gc_type in found:
+            return gc_type
+    return "Unknown"
+
+
+def classify_gc(jvm_parameters) -> str:
+    """
+    按完整的GC选择参数查表识别GC类型
+
+    与classify_gc_type不同，还能识别EpsilonGC和CMS，供按GC类型设置阈值的性能预言使用
+    """
+    return _classify_gc_flags(tuple(jvm_parameters))
@@ -3,7 +3,64 @@
 测试预言: 检测性能异常
 规则: 按JDK版本分组，在JDK版本内进行GC类型感知的性能分析
 """
-from typing import Dict, Any, Optional
+from collections import defaultdict
+from itertools import combinations
+from typing import Dict, Any, List, Optional
+
+from .gc_types import classify_gc
+
+
+# 根据GC类型设置不同的阈值（相对于同版本最快执行时间的倍数）
+_GC_THRESHOLDS = {
+    "SerialGC": 15,  # SerialGC相对稳定
+    "ParallelGC": 15,  # ParallelGC也比较稳定
+    "G1GC": 15.0,  # G1GC有一定波动性
+    "CMS": 20.0,  # CMS波动较大
+    "ZGC": 5.0,  # ZGC是低延迟GC，应该相对稳定
+    "ShenandoahGC": 15.0,  # ShenandoahGC也是低延迟GC
+    "EpsilonGC": 5.0,  # EpsilonGC不做GC，应该非常稳定
+    "Unknown": 15.0
+}
+
+
+def _cross_gc_anomalies(jdk_version: str, gc_groups: Dict[str, List], similar_gcs: List[str],
+                        max_ratio: float) -> List[Dict[str, Any]]:
+    """
+    对比同一JDK版本内相似GC类型的中位数执行时间，返回差异超过max_ratio倍的GC对
+
+    Args:
+        jdk_version: JDK版本
+        gc_groups: GC类型 -> 该GC类型的执行时间列表
+        similar_gcs: 需要相互对比的GC类型，按对比顺序排列
+        max_ratio: 两种GC中位数执行时间之比的上限
+    """
+    # 计算每种GC的中位数性能（只统计出现过的GC类型）
+    gc_medians = {}
+    for gc_type in similar_gcs:
+        durations = gc_groups.get(gc_type)
+        if durations:
+            gc_medians[gc_type] = sorted(durations)[len(durations) // 2]
+
+    anomalies = []
+    for gc1, gc2 in combinations(gc_medians, 2):
+        median1, median2 = gc_medians[gc1], gc_medians[gc2]
+        # 中位数相等时把前一个GC视为较慢的一方
+        if median1 >= median2:
+            slow_gc, slow_median, fast_gc, fast_median = gc1, median1, gc2, median2
+        else:
+            slow_gc, slow_median, fast_gc, fast_median = gc2, median2, gc1, median1
+        ratio = slow_median / fast_median
+        if ratio > max_ratio:
+            score = ratio  # 两种GC性能差异的倍数
+            anomalies.append({
+                "score": round(score, 4),  # 异常分数：两种GC性能差异的倍数
+                "info": (
+                    f"{jdk_version}-{slow_gc}: 执行时间异常，"
+                    f"执行时间（{slow_median:.2f}ms）比同版本的{fast_gc}"
+                    f"（{fast_median:.2f}ms）高{ratio:.1f}倍"
+                )
+            })
+    return anomalies
 
 
 def oracle_performance_anomaly(log_data: Dict[str, Any], file_path: str) -> Optional[Dict[str, Any]]:
@@ -18,34 +75,10 @@ def oracle_performance_anomaly(log_data: Dict[str, Any], file_path: str) -> Opti
     if not test_results:
         return None
 
-    # GC类型分类
-    def classify_gc(jvm_parameters):
-        params = [p.upper() for p in jvm_parameters]
-
-        if "-XX:+USEZGC" in params:
-            return "ZGC"
-        elif "-XX:+USESHENANDOAHGC" in params:
-            return "ShenandoahGC"
-        elif "-XX:+USEEPSILONGC" in params:
-            return "EpsilonGC"
-        elif "-XX:+USEG1GC" in params:
-            return "G1GC"
-        elif "-XX:+USEPARALLELGC" in params or "-XX:+USEPARALLELOLDGC" in params:
-            return "ParallelGC"
-        elif "-XX:+USESERIALGC" in params:
-            return "SerialGC"
-        elif "-XX:+USECONCMARKSWEEPGC" in params or "-XX:+USEPARNEWGC" in params:
-            return "CMS"
-        else:
-            return "Unknown"
-
     # 按JDK版本分组
-    jdk_groups = {}
+    jdk_groups = defaultdict(list)
     for result in test_results:
-        jdk_version = result.get("jdk_version", "unknown")
-        if jdk_version not in jdk_groups:
-            jdk_groups[jdk_version] = []
-        jdk_groups[jdk_version].append(result)
+        jdk_groups[result.get("jdk_version", "unknown")].append(result)
 
     slow_tests = []
     performance_anomalies = []
@@ -64,100 +97,40 @@ def oracle_performance_anomaly(log_data: Dict[str, Any], file_path: str) -> Opti
 
         # 计算该JDK版本内的整体性能基准
         all_durations = [test.get("duration_ms", 0) for test in successful_tests]
-        min_duration = min(all_durations)
-        median_duration = sorted(all_durations)[len(all_durations) // 2]
-
-        # 根据GC类型设置不同的阈值
-        gc_thresholds = {
-            "SerialGC": 15,  # SerialGC相对稳定
-            "ParallelGC": 15,  # ParallelGC也比较稳定
-            "G1GC": 15.0,  # G1GC有一定波动性
-            "CMS": 20.0,  # CMS波动较大
-            "ZGC": 5.0,  # ZGC是低延迟GC，应该相对稳定
-            "ShenandoahGC": 15.0,  # ShenandoahGC也是低延迟GC
-            "EpsilonGC": 5.0,  # EpsilonGC不做GC，应该非常稳定
-            "Unknown": 15.0
-        }
-
-        # 检测该JDK版本内的慢测试
-        for test in successful_tests:
-            duration = test.get("duration_ms", 0)
+        # 最小值和中位数（偶数个时取靠上的一个）都从同一次排序的结果中读取
+        sorted_durations = sorted(all_durations)
+        min_duration = sorted_durations[0]
+        median_duration = sorted_durations[len(sorted_durations) // 2]
+
+        # 一次遍历同时检测该JDK版本内的慢测试，并按GC类型分组执行时间供后面的统计分析使用
+        slow_bound = median_duration * 3
+        gc_groups = defaultdict(list)
+        for test, duration in zip(successful_tests, all_durations):
             gc_type = classify_gc(test.get("GC_parameters", []))
-
-            threshold_ratio = gc_thresholds.get(gc_type, 15.0)
-            threshold = min_duration * threshold_ratio
+            gc_groups[gc_type].append(duration)
 
             # 双重检查：既要超过阈值，也要显著高于中位数
-            if duration > threshold and duration > median_duration * 3:
+            if duration <= slow_bound:
+                continue
+            threshold_ratio = _GC_THRESHOLDS.get(gc_type, 15.0)
+            threshold = min_duration * threshold_ratio
+            if duration > threshold:
                 score = duration / threshold  # 超出阈值的倍数
                 slow_tests.append({
                     "score": round(score, 4),  # 异常分数：超出阈值的倍数
                     "info": f"{jdk_version}-{gc_type}: 执行时间异常，执行时间（{duration:.2f}ms）比同版本最快执行时间（{min_duration:.2f}ms）高{duration / min_duration:.1f}倍"
                 })
 
-        # 同JDK版本内，按GC类型分组进行统计分析
-        gc_groups = {}
-        for test in successful_tests:
-            gc_type = classify_gc(test.get("jvm_parameters", []))
-            if gc_type not in gc_groups:
-                gc_groups[gc_type] = []
-            gc_groups[gc_type].append(test.get("duration_ms", 0))
-
         # 分析相似GC类型之间的性能差异
-        gc_types_present = list(gc_groups.keys())
-
-        # 低延迟GC对比
-        low_latency_gcs = ["ZGC", "ShenandoahGC"]
-        present_low_latency = [gc for gc in low_latency_gcs if gc in gc_types_present]
-        if len(present_low_latency) >= 2:
-            # 计算每种低延迟GC的中位数性能
-            gc_medians = {}
-            for gc_type in present_low_latency:
-                if len(gc_groups[gc_type]) >= 1:  # 至少有一个数据点
-                    gc_medians[gc_type] = sorted(gc_groups[gc_type])[len(gc_groups[gc_type]) // 2]
-
-            if len(gc_medians) >= 2:
-                gc_list = list(gc_medians.keys())
-                for i in range(len(gc_list)):
-                    for j in range(i + 1, len(gc_list)):
-                        gc1, gc2 = gc_list[i], gc_list[j]
-                        ratio = max(gc_medians[gc1], gc_medians[gc2]) / min(gc_medians[gc1], gc_medians[gc2])
-                        if ratio > 5:  # 低延迟GC之间差异不应过大
-                            score = ratio  # 两种GC性能差异的倍数
-                            performance_anomalies.append({
-                                "score": round(score, 4),  # 异常分数：两种GC性能差异的倍数
-                                "info": (
-                                    f"{jdk_version}-{gc1 if gc_medians[gc1] >= gc_medians[gc2] else gc2}: 执行时间异常，"
-                                    f"执行时间（{max(gc_medians[gc1], gc_medians[gc2]):.2f}ms）比同版本的{gc2 if gc_medians[gc1] >= gc_medians[gc2] else gc1}"
-                                    f"（{min(gc_medians[gc1], gc_medians[gc2]):.2f}ms）高{ratio:.1f}倍"
-                                )
-                            })
-
-        # 吞吐量GC对比
-        throughput_gcs = ["SerialGC", "ParallelGC", "G1GC"]
-        present_throughput = [gc for gc in throughput_gcs if gc in gc_types_present]
-        if len(present_throughput) >= 2:
-            gc_medians = {}
-            for gc_type in present_throughput:
-                if len(gc_groups[gc_type]) >= 1:
-                    gc_medians[gc_type] = sorted(gc_groups[gc_type])[len(gc_groups[gc_type]) // 2]
-
-            if len(gc_medians) >= 2:
-                gc_list = list(gc_medians.keys())
-                for i in range(len(gc_list)):
-                    for j in range(i + 1, len(gc_list)):
-                        gc1, gc2 = gc_list[i], gc_list[j]
-                        ratio = max(gc_medians[gc1], gc_medians[gc2]) / min(gc_medians[gc1], gc_medians[gc2])
-                        if ratio > 10.0:  # 吞吐量GC之间允许较大差异
-                            score = ratio  # 两种GC性能差异的倍数
-                            performance_anomalies.append({
-                                "score": round(score, 4),  # 异常分数：两种GC性能差异的倍数
-                                "info": (
-                                    f"{jdk_version}-{gc1 if gc_medians[gc1] >= gc_medians[gc2] else gc2}: 执行时间异常，"
-                                    f"执行时间（{max(gc_medians[gc1], gc_medians[gc2]):.2f}ms）比同版本的{gc2 if gc_medians[gc1] >= gc_medians[gc2] else gc1}"
-                                    f"（{min(gc_medians[gc1], gc_medians[gc2]):.2f}ms）高{ratio:.1f}倍"
-                                )
-                            })
+        # 低延迟GC对比：低延迟GC之间差异不应过大
+        performance_anomalies.extend(
+            _cross_gc_anomalies(jdk_version, gc_groups, ["ZGC", "ShenandoahGC"], 5)
+        )
+
+        # 吞吐量GC对比：吞吐量GC之间允许较大差异
+        performance_anomalies.extend(
+            _cross_gc_anomalies(jdk_version, gc_groups, ["SerialGC", "ParallelGC", "G1GC"], 10.0)
+        )
 
     # 组合所有性能异常
     all_performance_issues = []
@@ -5,6 +5,8 @@
 """
 from typing import Dict, Any, Optional
 
+from .gc_types import classify_gc
+
 
 def oracle_performance_regression(log_data: Dict[str, Any], file_path: str) -> Optional[Dict[str, Any]]:
     """
@@ -18,27 +20,6 @@ def oracle_performance_regression(log_data: Dict[str, Any], file_path: str) -> O
     if not test_results:
         return None
 
-    # GC类型分类函数（复用之前的）
-    def classify_gc(jvm_parameters):
-        params = [p.upper() for p in jvm_parameters]
-
-        if "-XX:+USEZGC" in params:
-            return "ZGC"
-        elif "-XX:+USESHENANDOAHGC" in params:
-            return "ShenandoahGC"
-        elif "-XX:+USEEPSILONGC" in params:
-            return "EpsilonGC"
-        elif "-XX:+USEG1GC" in params:
-            return "G1GC"
-        elif "-XX:+USEPARALLELGC" in params or "-XX:+USEPARALLELOLDGC" in params:
-            return "ParallelGC"
-        elif "-XX:+USESERIALGC" in params:
-            return "SerialGC"
-        elif "-XX:+USECONCMARKSWEEPGC" in params or "-XX:+USEPARNEWGC" in params:
-            return "CMS"
-        else:
-            return "Unknown"
-
     # 按GC类型和JDK版本分组，只选择成功执行的结果
     gc_jdk_groups = {}
 
@@ -8,6 +8,8 @@
 """
 from typing import Dict, Any, Optional
 
+from .gc_types import classify_gc_type
+
 
 def oracle_stw_anomaly(log_data: Dict[str, Any], file_path: str) -> Optional[Dict[str, Any]]:
     """
@@ -31,25 +33,6 @@ def oracle_stw_anomaly(log_data: Dict[str, Any], file_path: str) -> Optional[Dic
         "Unknown": 3000       # 未知GC类型使用默认阈值
     }
 
-    # 识别GC类型的函数
-    def classify_gc_type(result: Dict[str, Any]) -> str:
-        """根据GC参数识别GC类型"""
-        gc_params = result.get("GC_parameters", [])
-        params_str = " ".join(gc_params).upper()
-        
-        if "+USEZGC" in params_str:
-            return "ZGC"
-        elif "+USESHENANDOAHGC" in params_str:
-            return "ShenandoahGC"
-        elif "+USEG1GC" in params_str:
-            return "G1GC"
-        elif "+USEPARALLELGC" in params_str or "+USEPARALLELOLDGC" in params_str:
-            return "ParallelGC"
-        elif "+USESERIALGC" in params_str:
-            return "SerialGC"
-        else:
-            return "Unknown"
-
     # 收集所有有效的GC结果数据
     gc_data = []
     for result in test_results:
@@ -3,8 +3,39 @@
 测试预言: 检测测试失败情况
 规则: 测试用例应该成功执行，但过滤掉环境相关的错误
 """
+import re
 from typing import Dict, Any, Optional
 
+from .gc_types import classify_gc_type
+
+
+# 环境相关错误的关键词列表
+_ENVIRONMENT_ERRORS = (
+    "NoClassDefFoundError",
+    "ClassNotFoundException",
+    "BootstrapMethodError",
+    "UnsupportedClassVersionError",
+    "NoSuchMethodError",  # 可能由于版本不兼容
+    "NoSuchFieldError",
+    "IllegalAccessError",
+    "InstantiationError",
+    "VerifyError",
+    "LinkageError",
+    "java.lang.invoke",  # 方法句柄相关错误
+    "java.lang.reflect",  # 反射相关错误
+    "java.security.AccessControlException",  # 访问控制异常
+    "java.lang.UnsupportedOperationException",  # 不支持的操作
+    "Unrecognized VM option",  # 未知VM选项
+    "Too many open files",  # 打开文件数过多
+    "unexpected pattern",  # 预期外的模式
+    "sun.misc",  # 内部API相关
+    "com.sun",  # 内部API相关
+    # 特定的错误模式
+    "Unsupported class version",  # 版本不兼容
+)
+# 所有关键词合并为一个忽略大小写的正则，判断错误是否是环境相关的时只需扫描一遍输出，也不用复制出大写的输出
+_ENVIRONMENT_ERROR_PATTERN = re.compile("|".join(map(re.escape, _ENVIRONMENT_ERRORS)), re.IGNORECASE)
+
 
 def oracle_test_failure(log_data: Dict[str, Any], file_path: str) -> Optional[Dict[str, Any]]:
     """
@@ -18,77 +49,13 @@ def oracle_test_failure(log_data: Dict[str, Any], file_path: str) -> Optional[Di
     if not test_results:
         return None
 
-    def classify_gc_type(result: Dict[str, Any]) -> str:
-        gc_params = result.get("GC_parameters", [])
-        params_str = " ".join(gc_params).upper()
-
-        if "+USEZGC" in params_str:
-            return "ZGC"
-        elif "+USESHENANDOAHGC" in params_str:
-            return "ShenandoahGC"
-        elif "+USEG1GC" in params_str:
-            return "G1GC"
-        elif "+USEPARALLELGC" in params_str or "+USEPARALLELOLDGC" in params_str:
-            return "ParallelGC"
-        elif "+USESERIALGC" in params_str:
-            return "SerialGC"
-        else:
-            return "Unknown"
-
-    # 环境相关错误的关键词列表
-    ENVIRONMENT_ERRORS = {
-        "NoClassDefFoundError",
-        "ClassNotFoundException",
-        "BootstrapMethodError",
-        "UnsupportedClassVersionError",
-        "NoSuchMethodError",  # 可能由于版本不兼容
-        "NoSuchFieldError",
-        "IllegalAccessError",
-        "InstantiationError",
-        "VerifyError",
-        "LinkageError",
-        "java.lang.invoke",  # 方法句柄相关错误
-        "java.lang.reflect",  # 反射相关错误
-        "java.security.AccessControlException",  # 访问控制异常
-        "java.lang.UnsupportedOperationException",  # 不支持的操作
-        "Unrecognized VM option",  # 未知VM选项
-        "Too many open files",  # 打开文件数过多
-        "unexpected pattern",  # 预期外的模式
-        "sun.misc",  # 内部API相关
-        "com.sun",  # 内部API相关
-    }
-
-    def is_environment_error(output: str) -> bool:
-        """判断错误是否是环境相关的"""
-        output_upper = output.upper()
-
-        # 检查是否包含环境错误关键词
-        for error_keyword in ENVIRONMENT_ERRORS:
-            if error_keyword.upper() in output_upper:
-                return True
-
-        # 检查特定的错误模式
-        error_patterns = [
-            "JAVA.LANG.INVOKE.",  # 方法句柄相关
-            "JAVA.LANG.REFLECT.",  # 反射相关
-            "SUN.MISC.",  # 内部API
-            "COM.SUN.",  # 内部API
-            "UNSUPPORTED CLASS VERSION",  # 版本不兼容
-        ]
-
-        for pattern in error_patterns:
-            if pattern in output_upper:
-                return True
-
-        return False
-
     failed_tests = []
     for result in test_results:
         if not result.get("success", True) or result.get("exit_code", 0) != 0:
             output = result.get("output", "")
 
             # 过滤环境相关错误
-            if is_environment_error(output):
+            if _ENVIRONMENT_ERROR_PATTERN.search(output):
                 continue  # 跳过环境错误
 
             # 真正的程序逻辑错误
@@ -0,0 +1,104 @@
+"""
+Executor端到端测试：用假的java可执行文件跑完整个JDK×GC组合矩阵
+
+只依赖标准库，可直接用最低支持的Python版本运行：
+    python3.7 -m unittest discover -s RunEnv/tests
+"""
+import json
+import os
+import shutil
+import stat
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+sys.path.insert(0, str(SRC_DIR))
+
+from Executor import JDKDifferentialTester  # noqa: E402
+
+# 假的java：忽略所有参数，输出一行后正常退出
+FAKE_JAVA = "#!/bin/sh\necho ok\nexit 0\n"
+
+
+class ExecutorTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, str(self.tmp), ignore_errors=True)
+
+        java = self.tmp / "jdk" / "bin" / "java"
+        java.parent.mkdir(parents=True)
+        java.write_text(FAKE_JAVA)
+        java.chmod(java.stat().st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+        env = {f"JDK{version}_HOME": str(self.tmp / "jdk") for version in JDKDifferentialTester.JDK_CONFIGS}
+        patcher = mock.patch.dict(os.environ, env)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        class_dir = self.tmp / "in" / "MyClass"
+        class_dir.mkdir(parents=True)
+        shutil.copy(str(SRC_DIR.parent / "MyClass.class"), str(class_dir / "MyClass.class"))
+
+    def test_runs_every_jdk_gc_combination(self):
+        tester = JDKDifferentialTester(timeout_seconds=30, max_workers=2)
+        tester.scan_and_test_directory(str(self.tmp / "in"), str(self.tmp / "out"))
+
+        with open(str(self.tmp / "out" / "MyClass" / "MyClass.json"), encoding="utf-8") as f:
+            report = json.load(f)
+        results = report["test_results"]
+        expected = sum(len(params) for params in JDKDifferentialTester.JDK_CONFIGS.values())
+        self.assertEqual(len(results), expected)
+        for result in results:
+            self.assertTrue(result["success"], result["output"])
+            self.assertIn("ok", result["output"])
+
+    def test_full_cmd_records_logical_gc_log_path(self):
+        tester = JDKDifferentialTester(timeout_seconds=30, max_workers=2)
+        tester.scan_and_test_directory(str(self.tmp / "in"), str(self.tmp / "out"))
+
+        with open(str(self.tmp / "out" / "MyClass" / "MyClass.json"), encoding="utf-8") as f:
+            report = json.load(f)
+        gc_logs_dir = str(self.tmp / "out" / "MyClass" / "MyClass.gclogs")
+        for result in report["test_results"]:
+            self.assertIn(f"-Xlog:gc*:file={gc_logs_dir}/jdk{result['jdk_version']}-", result["full_cmd"])
+        self.assertFalse(os.path.exists(gc_logs_dir))
+
+    def test_gc_logs_fall_back_to_disk_when_tmpfs_is_full(self):
+        statvfs_result = os.statvfs_result((4096, 4096, 1, 0, 0, 0, 0, 0, 0, 255))
+        with mock.patch("os.statvfs", return_value=statvfs_result):
+            tester = JDKDifferentialTester(timeout_seconds=30, max_workers=2)
+        self.assertEqual(os.path.dirname(tester._gc_tmp_dir), os.path.realpath(tempfile.gettempdir()))
+
+    def test_unnormalized_input_dir(self):
+        (self.tmp / "other").mkdir()
+        tester = JDKDifferentialTester(timeout_seconds=30, max_workers=2)
+        tester.scan_and_test_directory(str(self.tmp / "other" / ".." / "in") + os.sep, str(self.tmp / "out"))
+
+        self.assertTrue((self.tmp / "out" / "MyClass" / "MyClass.json").is_file())
+
+    def _scan_with_duplicate(self, **kwargs):
+        duplicate_dir = self.tmp / "in" / "sub" / "MyClass"
+        duplicate_dir.mkdir(parents=True)
+        shutil.copy(str(SRC_DIR.parent / "MyClass.class"), str(duplicate_dir / "MyClass.class"))
+        tester = JDKDifferentialTester(timeout_seconds=30, max_workers=2, **kwargs)
+        tester.scan_and_test_directory(str(self.tmp / "in"), str(self.tmp / "out"))
+
+        with open(str(self.tmp / "out" / "sub" / "MyClass" / "MyClass.json"), encoding="utf-8") as f:
+            return json.load(f)
+
+    def test_duplicates_are_tested_by_default(self):
+        report = self._scan_with_duplicate()
+        self.assertNotIn("duplicate_of", report)
+        self.assertTrue(report["test_results"])
+
+    def test_dedupe_reuses_results_of_duplicates(self):
+        report = self._scan_with_duplicate(dedupe=True)
+        self.assertEqual(report["duplicate_of"], str(self.tmp / "in" / "MyClass" / "MyClass.class"))
+        self.assertTrue(report["test_results"])
+
+
+if __name__ == "__main__":
+    unittest.main()
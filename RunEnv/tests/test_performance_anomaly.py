@@ -0,0 +1,75 @@
+"""
+性能异常预言测试：跨GC对比按结果中的GC_parameters分组
+"""
+import sys
+import types
+import unittest
+from pathlib import Path
+
+ORACLES_DIR = Path(__file__).resolve().parent.parent / "src" / "Test_oracles"
+# 预言包的__init__会导入仓库中没有的heap_anomaly模块，只注册包的搜索路径而不执行__init__，
+# 预言模块之间的相对导入照常生效
+for _name, _path in (("Test_oracles", ORACLES_DIR), ("Test_oracles.Base_oracles", ORACLES_DIR / "Base_oracles")):
+    if _name not in sys.modules:
+        _package = types.ModuleType(_name)
+        _package.__path__ = [str(_path)]
+        sys.modules[_name] = _package
+
+from Test_oracles.Base_oracles.performance_anomaly import oracle_performance_anomaly  # noqa: E402
+
+
+def _result(jdk_version, gc_flag, duration_ms):
+    """构造一条与Executor输出格式相同的测试结果（只有GC_parameters，没有jvm_parameters）"""
+    return {
+        "jdk_version": jdk_version,
+        "GC_parameters": [gc_flag],
+        "success": True,
+        "exit_code": 0,
+        "duration_ms": duration_ms,
+    }
+
+
+def _cross_gc_anomalies(report):
+    for issue in report["performance_issues"]:
+        if issue["subtype"] == "cross_gc_comparison":
+            return issue["anomalies"]
+    return []
+
+
+class PerformanceAnomalyTest(unittest.TestCase):
+
+    def test_low_latency_gcs_compared_by_gc_parameters(self):
+        # ZGC比Shenandoah慢6倍，超过低延迟GC之间5倍的上限
+        log_data = {"test_results": [
+            _result("21", "-XX:+UseZGC", 600),
+            _result("21", "-XX:+UseShenandoahGC", 100),
+        ]}
+        report = oracle_performance_anomaly(log_data, "Foo.json")
+        self.assertIsNotNone(report)
+        anomalies = _cross_gc_anomalies(report)
+        self.assertEqual(len(anomalies), 1)
+        self.assertEqual(anomalies[0]["score"], 6.0)
+        self.assertTrue(anomalies[0]["info"].startswith("21-ZGC:"))
+        self.assertIn("ShenandoahGC", anomalies[0]["info"])
+
+    def test_throughput_gcs_compared_by_gc_parameters(self):
+        # SerialGC比G1慢12倍，超过吞吐量GC之间10倍的上限；ParallelGC与G1相近不报告
+        log_data = {"test_results": [
+            _result("17", "-XX:+UseSerialGC", 1200),
+            _result("17", "-XX:+UseParallelGC", 110),
+            _result("17", "-XX:+UseG1GC", 100),
+        ]}
+        anomalies = _cross_gc_anomalies(oracle_performance_anomaly(log_data, "Foo.json"))
+        self.assertEqual([a["info"].split(":")[0] for a in anomalies], ["17-SerialGC", "17-SerialGC"])
+        self.assertEqual(sorted(a["score"] for a in anomalies), [10.9091, 12.0])
+
+    def test_similar_gcs_not_reported(self):
+        log_data = {"test_results": [
+            _result("21", "-XX:+UseZGC", 120),
+            _result("21", "-XX:+UseShenandoahGC", 100),
+        ]}
+        self.assertIsNone(oracle_performance_anomaly(log_data, "Foo.json"))
+
+
+if __name__ == "__main__":
+    unittest.main()
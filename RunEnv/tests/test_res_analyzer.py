@@ -0,0 +1,39 @@
+"""
+ResAnalyzer测试：并行分析多个结果文件
+"""
+import contextlib
+import io
+import json
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+# 导入时Test_oracles包不可用会打印错误提示，这里使用自定义预言，不需要该提示
+with contextlib.redirect_stdout(io.StringIO()):
+    from ResAnalyzer import ResAnalyzer  # noqa: E402
+
+
+class ScanAndAnalyzeDirectoryTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, str(self.tmp), ignore_errors=True)
+        for name in ("A", "B", "C"):
+            (self.tmp / f"{name}.json").write_text(json.dumps({"test_results": [], "name": name}))
+
+    def test_unpicklable_oracles_fall_back_to_threads(self):
+        threshold = "B"
+        oracles = [lambda log_data, file_path: {"type": "closure", "file_path": file_path}
+                   if log_data["name"] >= threshold else None]
+
+        anomalies = ResAnalyzer(oracles=oracles, max_workers=2).scan_and_analyze_directory(str(self.tmp))
+
+        self.assertEqual(sorted(Path(anomaly["file_path"]).name for anomaly in anomalies), ["B.json", "C.json"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,46 @@
+"""
+ClassFileRunner测试：确定运行类文件时放入类路径的目录
+"""
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+sys.path.insert(0, str(SRC_DIR))
+
+from TestRun import ClassFileRunner  # noqa: E402
+
+
+class PrepareTestTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, str(self.tmp), ignore_errors=True)
+        self.class_dir = self.tmp / "MyClass"
+        self.class_dir.mkdir()
+        self.class_file = self.class_dir / "MyClass.class"
+        shutil.copy(str(SRC_DIR.parent / "MyClass.class"), str(self.class_file))
+        self.runner = ClassFileRunner()
+
+    def test_lone_class_file_runs_from_its_directory(self):
+        package_name, class_name, class_dir, temp_dir = self.runner._prepare_test(self.class_file, "MyClass")
+
+        self.assertEqual((package_name, class_name), ("", "MyClass"))
+        self.assertEqual(class_dir, os.path.abspath(str(self.class_dir)))
+        self.assertIsNone(temp_dir)
+
+    def test_class_file_with_siblings_is_staged_alone(self):
+        shutil.copy(str(self.class_file), str(self.class_dir / "Other.class"))
+
+        package_name, class_name, class_dir, temp_dir = self.runner._prepare_test(self.class_file, "MyClass")
+        self.addCleanup(self.runner.release_temp_class_structure, temp_dir, package_name, class_name)
+
+        self.assertEqual(class_dir, temp_dir)
+        self.assertEqual(os.listdir(class_dir), ["MyClass.class"])
+
+
+if __name__ == "__main__":
+    unittest.main()